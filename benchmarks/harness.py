@@ -0,0 +1,94 @@
+import json
+import logging as log
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+logger = log.getLogger('Benchmarks')
+# a benchmark does its work once per call, and returns how many Intcode instructions it executed (None if it runs none)
+Workload = Callable[[], Optional[int]]
+
+
+class RegressionError(RuntimeError):
+
+    def __init__(self, error_msg):
+        super().__init__(error_msg)
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # builds the workload, so that setup (parsing, generating inputs) isn't timed
+    setup: Callable[[], Workload]
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    # the fastest of the repeats, which is the least disturbed by everything else running on the machine
+    wall_seconds: float
+    instructions: Optional[int]
+
+    @property
+    def instructions_per_second(self) -> Optional[float]:
+        if self.instructions is None or self.wall_seconds == 0:
+            return None
+        return self.instructions / self.wall_seconds
+
+    def __str__(self):
+        throughput = '' if self.instructions_per_second is None \
+            else f', {self.instructions} instructions, {self.instructions_per_second:,.0f} instructions/s'
+        return f'{self.name}: {self.wall_seconds:.4f}s{throughput}'
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int = 5) -> BenchmarkResult:
+    workload = benchmark.setup()
+    timings = []
+    instructions = None
+    for _ in range(repeat):
+        started = perf_counter()
+        instructions = workload()
+        timings.append(perf_counter() - started)
+    return BenchmarkResult(benchmark.name, min(timings), instructions)
+
+
+def run_suite(benchmarks: List[Benchmark], repeat: int = 5) -> List[BenchmarkResult]:
+    results = []
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, repeat)
+        logger.info('%s', result)
+        results.append(result)
+    return results
+
+
+def save_results(results: List[BenchmarkResult], path: str) -> None:
+    with open(path, 'w') as target:
+        json.dump({result.name: {'wall_seconds': result.wall_seconds, 'instructions': result.instructions}
+                   for result in results}, target, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, BenchmarkResult]:
+    with open(path, 'r') as source:
+        return {name: BenchmarkResult(name, saved['wall_seconds'], saved['instructions'])
+                for name, saved in json.load(source).items()}
+
+
+def regressions(results: List[BenchmarkResult], baseline: Dict[str, BenchmarkResult],
+                tolerance: float = 0.25) -> List[str]:
+    # a benchmark has regressed once it takes more than `tolerance` longer than its baseline, or when it now
+    # executes a different number of instructions (i.e. it isn't doing the same work any more)
+    found = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected is None:
+            continue
+        if expected.instructions is not None and result.instructions != expected.instructions:
+            found.append(f'{result.name}: executed {result.instructions} instructions, '
+                         f'baseline executed {expected.instructions}')
+        if result.wall_seconds > expected.wall_seconds * (1 + tolerance):
+            found.append(f'{result.name}: took {result.wall_seconds:.4f}s, '
+                         f'baseline took {expected.wall_seconds:.4f}s (+{tolerance:.0%} allowed)')
+    return found
+
+
+def check_against(results: List[BenchmarkResult], baseline_path: str, tolerance: float = 0.25) -> None:
+    found = regressions(results, load_results(baseline_path), tolerance)
+    if len(found) > 0:
+        raise RegressionError('Benchmarks regressed against the baseline:\n * ' + '\n * '.join(found))
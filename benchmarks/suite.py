@@ -0,0 +1,149 @@
+import argparse
+import logging as log
+import os
+from random import Random
+from typing import List
+
+from benchmarks.harness import Benchmark, Workload, run_suite, save_results, check_against, logger
+from day3.main import Line
+from day4.secure_container import SecureContainer
+from day6.tree import OrbitalTree
+from shared.int_code_computers.compiler import CompiledProgram
+from shared.int_code_computers.program import Program
+from shared.int_code_computers.search import ParameterSweep, noun_verb_pairs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# every generated input is seeded, so every run of the suite does exactly the same work
+SEED = 2019
+
+
+def count_down_image(iterations: int) -> List[int]:
+    # counts cell 9 down to 0, jumping back to the start while it isn't 0
+    return [1001, 9, -1, 9, 1005, 9, 0, 99, 0, iterations]
+
+
+def sum_loop_image(iterations: int) -> List[int]:
+    # adds up 0 until `iterations` in to cell 20, using position & immediate modes, and less than to test the loop
+    return [1, 20, 21, 20,
+            1001, 21, 1, 21,
+            1007, 21, iterations, 22,
+            1005, 22, 0,
+            99, 0, 0, 0, 0,
+            0, 0, 0]
+
+
+def intcode_workload(program_type: type, image: List[int]) -> Workload:
+    def workload():
+        program = program_type(image.copy())
+        program.run()
+        return program.instructions_executed
+    return workload
+
+
+def day2_image() -> List[int]:
+    with open(os.path.join(ROOT, 'day2', 'input.txt'), 'r') as source:
+        return list(map(int, source.read().split(',')))
+
+
+def day2_sweep() -> Workload:
+    image = day2_image()
+    pairs = noun_verb_pairs()
+
+    def workload():
+        sweep = ParameterSweep(image)
+        for _ in sweep.results(pairs):
+            pass
+        return sweep.instructions_executed
+    return workload
+
+
+def day2_fresh_programs() -> Workload:
+    # what the sweep saves on: a new program, and a copy of its memory, for every pair
+    image = day2_image()
+    pairs = noun_verb_pairs()
+
+    def workload():
+        executed = 0
+        for noun, verb in pairs:
+            memory = image.copy()
+            memory[1:3] = [noun, verb]
+            program = Program(memory)
+            program.run()
+            executed += program.instructions_executed
+        return executed
+    return workload
+
+
+def wire_path(random: Random, segments: int) -> str:
+    # alternates between horizontal and vertical moves, like the puzzle input does
+    moves = []
+    for segment in range(segments):
+        direction = random.choice('LR' if segment % 2 == 0 else 'UD')
+        moves.append(f'{direction}{random.randint(1, 1000)}')
+    return ','.join(moves)
+
+
+def day3_wires(segments: int) -> Workload:
+    random = Random(SEED)
+    paths = (wire_path(random, segments), wire_path(random, segments))
+
+    def workload():
+        Line(paths[0]).get_intercepts(Line(paths[1]))
+    return workload
+
+
+def day4_range_scan(start: int, end: int) -> Workload:
+    def workload():
+        for pwd in range(start, end):
+            SecureContainer.is_valid_pwd(pwd)
+    return workload
+
+
+def day6_orbits(bodies: int) -> Workload:
+    random = Random(SEED)
+    names = ['COM'] + [f'B{number}' for number in range(1, bodies)]
+    orbits = [(names[random.randrange(number)], names[number]) for number in range(1, bodies)]
+
+    def workload():
+        tree = OrbitalTree()
+        for parent, child in orbits:
+            tree.add_node(parent, child)
+        tree.orbital_orders()
+        tree.path_to(names[-1])
+        tree.path_to(names[len(names) // 2])
+    return workload
+
+
+BENCHMARKS = [
+    Benchmark('intcode.count_down', lambda: intcode_workload(Program, count_down_image(50_000))),
+    Benchmark('intcode.sum_loop', lambda: intcode_workload(Program, sum_loop_image(25_000))),
+    Benchmark('intcode.sum_loop.compiled', lambda: intcode_workload(CompiledProgram, sum_loop_image(25_000))),
+    Benchmark('day2.sweep', day2_sweep),
+    Benchmark('day2.sweep.fresh_programs', day2_fresh_programs),
+    Benchmark('day3.wires_x2', lambda: day3_wires(600)),
+    Benchmark('day4.range_scan', lambda: day4_range_scan(109165, 209165)),
+    Benchmark('day6.orbits', lambda: day6_orbits(2000)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the Intcode interpreter and the day solvers')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', default='', help='only runs benchmarks whose name starts with this')
+    parser.add_argument('--save', help='writes the results to this file, to use as a baseline later')
+    parser.add_argument('--baseline', help='fails when the results regressed against this file')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+    results = run_suite([benchmark for benchmark in BENCHMARKS if benchmark.name.startswith(args.only)],
+                        args.repeat)
+    if args.save is not None:
+        save_results(results, args.save)
+    if args.baseline is not None:
+        check_against(results, args.baseline, args.tolerance)
+
+
+if __name__ == '__main__':
+    # the solvers log at info level, which would swamp the results and skew the timings
+    log.basicConfig(level=log.WARNING)
+    logger.setLevel(log.INFO)
+    main()
@@ -0,0 +1,55 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.harness import Benchmark, BenchmarkResult, RegressionError, run_benchmark, save_results, \
+    load_results, regressions, check_against
+from benchmarks.suite import intcode_workload, count_down_image, sum_loop_image
+from shared.int_code_computers.compiler import CompiledProgram
+from shared.int_code_computers.program import Program
+
+
+class TestHarness(TestCase):
+
+    def test_run_benchmark(self):
+        calls = []
+        result = run_benchmark(Benchmark('counting', lambda: lambda: calls.append(1) or 10), repeat=3)
+        self.assertEqual(3, len(calls))
+        self.assertEqual(10, result.instructions)
+        self.assertGreater(result.instructions_per_second, 0)
+
+    def test_no_throughput_without_instructions(self):
+        result = BenchmarkResult('solver', 0.5, None)
+        self.assertIsNone(result.instructions_per_second)
+        self.assertEqual('solver: 0.5000s', str(result))
+
+    def test_intcode_workloads(self):
+        self.assertEqual(200, intcode_workload(Program, count_down_image(100))())
+        self.assertEqual(4 * 100, intcode_workload(CompiledProgram, sum_loop_image(100))())
+
+    def test_sum_loop_image(self):
+        p = Program(sum_loop_image(100))
+        p.run()
+        self.assertEqual(sum(range(100)), p.state.at(20))
+
+    def test_save_and_load(self):
+        results = [BenchmarkResult('a', 1.5, 100), BenchmarkResult('b', 0.25, None)]
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_results(results, path)
+            self.assertEqual({result.name: result for result in results}, load_results(path))
+
+    def test_regressions(self):
+        baseline = {'a': BenchmarkResult('a', 1.0, 100), 'b': BenchmarkResult('b', 1.0, None)}
+        self.assertEqual([], regressions([BenchmarkResult('a', 1.2, 100), BenchmarkResult('c', 9.0, None)],
+                                         baseline))
+        self.assertEqual(1, len(regressions([BenchmarkResult('b', 1.3, None)], baseline)))
+        self.assertEqual(1, len(regressions([BenchmarkResult('a', 0.5, 101)], baseline)))
+
+    def test_check_against_fails_loudly(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_results([BenchmarkResult('a', 1.0, 100)], path)
+            check_against([BenchmarkResult('a', 1.1, 100)], path)
+            with self.assertRaises(RegressionError):
+                check_against([BenchmarkResult('a', 2.0, 100)], path)
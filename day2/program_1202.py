@@ -2,8 +2,10 @@ import logging as log
 from itertools import chain
 from typing import List
 
+from shared.int_code_computers.loader import load
 from shared.int_code_computers.program import Program
-from shared.utils import IO
+from shared.int_code_computers.search import solve_for, noun_verb_ranges
+from shared.int_code_computers.state import ArrayMemory
 
 
 def part_1(data: List[int]):
@@ -19,28 +21,19 @@ def part_1(data: List[int]):
 
 def part_2(data: List[int]):
     hoped_for_value: int = 19690720
-    result_found = False
     # hoped_for_value: int = 34551522
-    for noun in range(100):
-        if result_found:
-            break
-        for verb in range(100):
-            test_data = data.copy()
-            test_data[1:3] = [noun, verb]
-            result: int = Program(test_data).run()
-            log.info('-------------------------------------------------------------------')
-            if result == hoped_for_value:
-                result_found = True
-                log.info('Found values to look for in part 2. Noun: %s, Verb: %s', noun, verb)
-                log.info('Calculated result of part 2 question: %s', 100 * noun + verb)
-                break
-            else:
-                log.info('Attempted Noun:%s, Verb:%s - program did not yield hoped for value', noun, verb)
+    found = solve_for(data, hoped_for_value, noun_verb_ranges())
+    if found is None:
+        log.info('No noun and verb in the range yielded the hoped for value: %s', hoped_for_value)
+    else:
+        noun, verb = found
+        log.info('Found values to look for in part 2. Noun: %s, Verb: %s', noun, verb)
+        log.info('Calculated result of part 2 question: %s', 100 * noun + verb)
 
 
 def main():
     # load the program data
-    data: List[int] = IO.read_as_one_line(lambda line: list(map(int, line.split(","))))
+    data: ArrayMemory = load('input.txt')
     part_1(data.copy())
     part_2(data.copy())
 
@@ -0,0 +1,76 @@
+from bisect import bisect_left, insort
+from typing import List, Sequence, Tuple, Iterable, Optional, Any
+
+from day3.packed import PackedWire
+
+# a segment of a wire: is it vertical, its start & end (x, y), and the steps along the wire to its start
+Span = Tuple[bool, int, int, int, int, int]
+# where two wires cross: index of the segment on the first wire, then on the second, x, y, combined steps to it
+Crossing = Tuple[int, int, int, int, int]
+
+# sweep events at the same x: horizontals are added before verticals are checked against them, and removed after
+__ADD, __CHECK, __REMOVE = 0, 1, 2
+
+
+def crossings(first: Sequence[Span], second: Sequence[Span]) -> List[Crossing]:
+    # finds the same crossings as checking every pair of segments, and in the same order, with O(n log n + k)
+    # comparisons. only a vertical and a horizontal segment can cross, parallel segments never do (just like
+    # Segment.intersect)
+    found = sweep([(index, span) for index, span in enumerate(first) if span[0]],
+                  [(index, span) for index, span in enumerate(second) if not span[0]]) + \
+        [(horizontal, vertical, x, y, steps) for vertical, horizontal, x, y, steps
+         in sweep([(index, span) for index, span in enumerate(second) if span[0]],
+                  [(index, span) for index, span in enumerate(first) if not span[0]])]
+    found.sort()
+    return found
+
+
+def sweep(verticals: Sequence[Tuple[Any, Span]], horizontals: Sequence[Tuple[Any, Span]]) \
+        -> List[Tuple[Any, Any, int, int, int]]:
+    # sweeps a line across x, keeping the horizontals it currently crosses sorted by y. every vertical then only
+    # has to look at the horizontals within its own span of y. segments come tagged, and crossings are reported as
+    # (vertical's tag, horizontal's tag, x, y, combined steps). the horizontals are kept in a plain list: finding
+    # where one goes is a bisect, but inserting or removing it shifts the ones after it, so each event is O(n) and
+    # the worst case (every horizontal crossed at once) is quadratic. the shift is a single memmove, which stays
+    # cheap for anything like a puzzle input
+    events = []
+    for number, (_, (_, x1, y1, x2, _, _)) in enumerate(horizontals):
+        events.append((min(x1, x2), __ADD, number))
+        events.append((max(x1, x2), __REMOVE, number))
+    for number, (_, (_, x1, _, _, _, _)) in enumerate(verticals):
+        events.append((x1, __CHECK, number))
+    events.sort()
+    active: List[Tuple[int, int]] = []
+    found = []
+    for x, kind, number in events:
+        if kind == __ADD:
+            insort(active, (horizontals[number][1][2], number))
+        elif kind == __REMOVE:
+            del active[bisect_left(active, (horizontals[number][1][2], number))]
+        else:
+            vertical_tag, (_, vx, vy1, _, vy2, vertical_steps) = verticals[number]
+            position = bisect_left(active, (min(vy1, vy2), -1))
+            highest = max(vy1, vy2)
+            while position < len(active) and active[position][0] <= highest:
+                y, horizontal = active[position]
+                horizontal_tag, (_, hx1, hy1, _, _, horizontal_steps) = horizontals[horizontal]
+                found.append((vertical_tag, horizontal_tag, x, y,
+                              abs(y - vy1) + vertical_steps + abs(x - hx1) + horizontal_steps))
+                position += 1
+    return found
+
+
+def spans(path: str) -> List[Span]:
+    # the spans of a wire straight from its path, without building any segments
+    return PackedWire(path).spans()
+
+
+def closest(found: Iterable[Crossing]) -> Optional[Tuple[int, int]]:
+    # the smallest manhattan distance from the origin, and the fewest combined steps, over every crossing. where
+    # both wires start doesn't count as a crossing
+    distances, steps = [], []
+    for _, _, x, y, combined_steps in found:
+        if combined_steps > 0:
+            distances.append(abs(x) + abs(y))
+            steps.append(combined_steps)
+    return (min(distances), min(steps)) if len(distances) > 0 else None
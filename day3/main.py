@@ -4,6 +4,10 @@ from functools import reduce
 from time import time_ns
 from typing import List, Tuple, Optional, AnyStr
 
+from day3.intersections import crossings, Span
+from day3.packed import PackedWire
+from day3.vectorized import closest_crossing
+from day3.wire_set import WireSet
 from shared.utils import IO
 
 
@@ -15,6 +19,7 @@ class Direction(Enum):
 
 
 class Coordinate:
+    __slots__ = ('x', 'y')
     x: int
     y: int
 
@@ -32,9 +37,11 @@ class Coordinate:
 
 
 class Segment:
+    __slots__ = ('direction', 'length', 'start', 'starting_position_along_line', 'end')
     logger = log.getLogger('Segment')
     __vertical_directions = [Direction.UP, Direction.DOWN]
     __horizontal_directions = [Direction.LEFT, Direction.RIGHT]
+    __moves = {Direction.UP: (0, 1), Direction.DOWN: (0, -1), Direction.LEFT: (-1, 0), Direction.RIGHT: (1, 0)}
     direction: Direction
     length: int
     start: Coordinate
@@ -42,20 +49,12 @@ class Segment:
     end: Coordinate
 
     def __init__(self, direction: Direction, length: int, starting_coord: Coordinate, starting_position_on_line: int):
-        Segment.logger.debug('Creating new segment with direction: %s, length: %s, starting coord: %s',
-                             direction, length, starting_coord)
-        self.direction = Direction(direction)
+        self.direction = direction
         self.length = length
         self.start = starting_coord
         self.starting_position_along_line = starting_position_on_line
-        if self.direction == Direction.UP:
-            self.end = Coordinate(0 + starting_coord.x, 1 * self.length + starting_coord.y)
-        if self.direction == Direction.DOWN:
-            self.end = Coordinate(0 + starting_coord.x, -1 * self.length + starting_coord.y)
-        if self.direction == Direction.RIGHT:
-            self.end = Coordinate(1 * self.length + starting_coord.x, 0 + starting_coord.y)
-        if self.direction == Direction.LEFT:
-            self.end = Coordinate(-1 * self.length + starting_coord.x, 0 + starting_coord.y)
+        dx, dy = Segment.__moves[direction]
+        self.end = Coordinate(dx * length + starting_coord.x, dy * length + starting_coord.y)
 
     def intersect(self, another) -> Tuple[bool, Optional[Coordinate], Optional[int]]:
         # check if a vertical line intersects with another horizontal line
@@ -103,7 +102,18 @@ class Line:
             self.relative_pathing.append(segment.end)
             line_length = line_length + segment.length
 
+    def spans(self) -> List[Span]:
+        return self.packed().spans()
+
+    def packed(self) -> PackedWire:
+        return PackedWire(self.__path)
+
     def get_intercepts(self, another) -> List[Tuple[Coordinate, int]]:
+        # the same intercepts, in the same order, as scan_intercepts, without checking every pair of segments
+        intercepts = [(Coordinate(x, y), steps) for _, _, x, y, steps in crossings(self.spans(), another.spans())]
+        return Line.__without_origin(intercepts)
+
+    def scan_intercepts(self, another) -> List[Tuple[Coordinate, int]]:
         intercepts = []
         for seg1 in self.segments:
             for seg2 in another.segments:
@@ -112,10 +122,19 @@ class Line:
                     Line.logger.debug("Found the intercept %s (length: %s) for:\n * seg: %s \n * and: %s",
                                       coord, length_of_line_till_intercept, seg1, seg2)
                     intercepts.append((coord, length_of_line_till_intercept))
-        if intercepts[0][0].x == 0 and intercepts[0][0].y == 0:
+        return Line.__without_origin(intercepts)
+
+    @staticmethod
+    def __without_origin(intercepts: List[Tuple[Coordinate, int]]) -> List[Tuple[Coordinate, int]]:
+        if len(intercepts) > 0 and intercepts[0][0].x == 0 and intercepts[0][0].y == 0:
             intercepts.pop(0)
         return intercepts
 
+    def closest_intercept(self, another) -> Optional[Tuple[int, int]]:
+        # the smallest manhattan distance and fewest combined steps to an intercept, with numpy when it's installed.
+        # doesn't build any segments or coordinates, so it suits bulk queries
+        return closest_crossing(self.__path, another.__path)
+
     def intercepts(self, another):
         Line.logger.debug('Seeing if line %s intercepts with line %s', self.__path, another.__path)
         has_intercepts = len(self.get_intercepts(another)) > 0
@@ -128,12 +147,14 @@ def main():
     log.basicConfig(level=log.INFO)
     t1 = time_ns()
     path_defs: List[AnyStr] = IO.read_lines(lambda x: x)
-    l1 = Line(path_defs[0])
-    l2 = Line(path_defs[1])
-    intercepts = l1.get_intercepts(l2)
-    min_distance_2 = min(map(lambda x: abs(x.x + x.y), [x[0] for x in intercepts]))
-    log.info("Min intercept between l1 & l3: %s", min_distance_2)
-    log.info("Min combined distance to an intercept: %s", reduce(lambda a, b: a if a[1] < b[1] else b, intercepts)[1])
+    wires = WireSet(path_defs)
+    for (first, second), (distance, steps) in sorted(wires.all_closest().items()):
+        log.info("Min intercept between l%s & l%s: %s", first + 1, second + 1, distance)
+        log.info("Min combined distance to an intercept of l%s & l%s: %s", first + 1, second + 1, steps)
+    fewest = wires.fewest_combined_steps()
+    if fewest is not None:
+        log.info("Min combined distance to an intercept over all wires: %s (l%s & l%s)",
+                 fewest[1], fewest[0][0] + 1, fewest[0][1] + 1)
     t2 = time_ns()
     log.info("Run took :%ss", (t2 - t1) / 1e9)
 
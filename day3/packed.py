@@ -0,0 +1,49 @@
+from array import array
+from itertools import accumulate
+from operator import mul, sub
+from typing import List, Tuple, Union
+
+
+class PackedWire:
+    # a wire's segments as packed columns of machine ints, one column per field rather than objects per segment.
+    # every column is built in one pass over the path, by map & accumulate rather than a python loop
+    __slots__ = ('vertical', 'x1', 'y1', 'x2', 'y2', 'steps')
+    # byte translation tables from a direction to its step along x & y (as signed bytes), and whether it's vertical
+    __x = bytes.maketrans(b'UDLR', b'\x00\x00\xff\x01')
+    __y = bytes.maketrans(b'UDLR', b'\x01\xff\x00\x00')
+    __vertical = bytes.maketrans(b'UDLR', b'\x01\x01\x00\x00')
+    vertical: bytes
+    x1: array
+    y1: array
+    x2: array
+    y2: array
+    steps: array
+
+    def __init__(self, path: Union[str, bytes]):
+        encoded = path.encode('ascii') if isinstance(path, str) else path
+        directions = encoded.translate(None, b'0123456789, \t\r\n')
+        lengths = array('q', map(int, encoded.translate(None, b'UDLR \t\r\n').split(b',')))
+        dx = array('q', map(mul, PackedWire.__signed(directions.translate(PackedWire.__x)), lengths))
+        dy = array('q', map(mul, PackedWire.__signed(directions.translate(PackedWire.__y)), lengths))
+        self.vertical = directions.translate(PackedWire.__vertical)
+        self.x2, self.y2 = array('q', accumulate(dx)), array('q', accumulate(dy))
+        self.x1, self.y1 = array('q', map(sub, self.x2, dx)), array('q', map(sub, self.y2, dy))
+        self.steps = array('q', map(sub, accumulate(lengths), lengths))
+
+    @staticmethod
+    def __signed(steps: bytes) -> array:
+        signed = array('b')
+        signed.frombytes(steps)
+        return signed
+
+    def __len__(self):
+        return len(self.vertical)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.vertical) + sum(len(column) * column.itemsize
+                                        for column in (self.x1, self.y1, self.x2, self.y2, self.steps))
+
+    def spans(self) -> List[Tuple[bool, int, int, int, int, int]]:
+        # as the tuples the sweep in intersections works on
+        return list(zip(map(bool, self.vertical), self.x1, self.y1, self.x2, self.y2, self.steps))
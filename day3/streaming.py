@@ -0,0 +1,149 @@
+import logging as log
+from bisect import bisect_left, insort
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional, Union, BinaryIO, TextIO
+
+from day3.intersections import Crossing
+
+# one move along a wire: which wire (by its line in the input), direction, length
+Move = Tuple[int, str, int]
+Source = Union[BinaryIO, TextIO, Iterable[Union[str, bytes]]]
+CHUNK_SIZE = 1 << 16
+# segments are indexed in strips this wide across the other axis, a segment goes in every strip it reaches in to
+STRIP_WIDTH = 1 << 10
+# a segment as it's indexed: where it is on its fixed axis, its lowest & highest and starting position on the other,
+# steps to its start and its index
+Indexed = Tuple[int, int, int, int, int, int]
+
+
+def read_moves(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[Move]:
+    # moves from wires written one per line, read a chunk at a time from a file, or from an iterator of chunks (like
+    # a socket's). a move a chunk ends part way through is carried over to the next one
+    wire, carried, on_line = 0, '', False
+    for chunk in __chunks(source, chunk_size):
+        lines = (carried + (chunk.decode('ascii') if isinstance(chunk, bytes) else chunk)).split('\n')
+        carried = lines.pop()
+        for line in lines:
+            for token in line.split(','):
+                if token.strip():
+                    on_line = True
+                    yield (wire,) + __parse(token)
+            if on_line:
+                wire, on_line = wire + 1, False
+        tokens = carried.split(',')
+        carried = tokens.pop()
+        for token in tokens:
+            if token.strip():
+                on_line = True
+                yield (wire,) + __parse(token)
+    if carried.strip():
+        yield (wire,) + __parse(carried)
+
+
+def __parse(token: str) -> Tuple[str, int]:
+    token = token.strip()
+    return token[0], int(token[1:])
+
+
+def __chunks(source: Source, chunk_size: int) -> Iterator[Union[str, bytes]]:
+    if not hasattr(source, 'read'):
+        yield from source
+        return
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class StreamingCrossings:
+    # finds the crossings of two wires as their segments arrive, in any order between the wires. each new segment is
+    # only checked against the other wire's segments so far, so every crossing is found once, when the later of its
+    # two segments arrives. those are looked up in the one strip the new segment is in, by bisecting the ones there
+    # on its own axis. only the segments' ends & steps are kept, never the paths or Segment objects
+    logger = log.getLogger('StreamingCrossings')
+    __moves = {'U': (0, 1), 'D': (0, -1), 'L': (-1, 0), 'R': (1, 0)}
+    # how many crossings have been found so far, including where both wires start
+    crossings_found: int
+    # per wire: where it's got to (x, y), the steps along it so far and how many segments it has
+    __ends: List[Tuple[int, int, int, int]]
+    # per wire, by strip of y, sorted by x: (x, lowest y, highest y, starting y, steps to start, segment index)
+    __verticals: List[Dict[int, List[Indexed]]]
+    # per wire, by strip of x, sorted by y: (y, lowest x, highest x, starting x, steps to start, segment index)
+    __horizontals: List[Dict[int, List[Indexed]]]
+    __distance: Optional[int]
+    __steps: Optional[int]
+
+    def __init__(self):
+        self.crossings_found = 0
+        self.__ends = [(0, 0, 0, 0), (0, 0, 0, 0)]
+        self.__verticals = [{}, {}]
+        self.__horizontals = [{}, {}]
+        self.__distance, self.__steps = None, None
+
+    @property
+    def closest(self) -> Optional[Tuple[int, int]]:
+        # the smallest manhattan distance and fewest combined steps over the crossings so far, like
+        # intersections.closest does for all of them
+        return None if self.__distance is None else (self.__distance, self.__steps)
+
+    def segments(self, wire: int) -> int:
+        return self.__ends[wire][3]
+
+    def add(self, wire: int, direction: str, length: int) -> List[Crossing]:
+        # the crossings the new segment makes, as (index on the first wire, index on the second, x, y, steps)
+        if wire not in (0, 1):
+            raise RuntimeError('Only two wires can be streamed, got a move for wire {}'.format(wire))
+        x, y, steps, index = self.__ends[wire]
+        dx, dy = StreamingCrossings.__moves[direction]
+        end_x, end_y = x + dx * length, y + dy * length
+        if dx == 0:
+            found = StreamingCrossings.__cross(self.__horizontals[1 - wire].get(x // STRIP_WIDTH, []), x, y, end_y,
+                                               steps, index)
+            StreamingCrossings.__index(self.__verticals[wire], (x, min(y, end_y), max(y, end_y), y, steps, index))
+        else:
+            found = [(new, other, x_at, y_at, combined) for new, other, y_at, x_at, combined
+                     in StreamingCrossings.__cross(self.__verticals[1 - wire].get(y // STRIP_WIDTH, []), y, x, end_x,
+                                                   steps, index)]
+            StreamingCrossings.__index(self.__horizontals[wire], (y, min(x, end_x), max(x, end_x), x, steps, index))
+        self.__ends[wire] = (end_x, end_y, steps + length, index + 1)
+        if wire == 1:
+            found = [(other, new, x_at, y_at, combined) for new, other, x_at, y_at, combined in found]
+        for _, _, x_at, y_at, combined in found:
+            if combined > 0:
+                distance = abs(x_at) + abs(y_at)
+                self.__distance = distance if self.__distance is None else min(self.__distance, distance)
+                self.__steps = combined if self.__steps is None else min(self.__steps, combined)
+        self.crossings_found += len(found)
+        return found
+
+    def feed(self, moves: Iterable[Move]) -> Iterator[Tuple[int, int]]:
+        # adds every move, giving the running minima each time they improve, long before the input is finished
+        for wire, direction, length in moves:
+            before = self.closest
+            self.add(wire, direction, length)
+            if self.closest != before:
+                self.logger.debug('Closest crossing is now %s, after %s & %s segments', self.closest,
+                                  self.segments(0), self.segments(1))
+                yield self.closest
+
+    @staticmethod
+    def __index(strips: Dict[int, List[Indexed]], segment: Indexed) -> None:
+        for strip in range(segment[1] // STRIP_WIDTH, segment[2] // STRIP_WIDTH + 1):
+            insort(strips.setdefault(strip, []), segment)
+
+    @staticmethod
+    def __cross(others: List[Indexed], at: int, start: int, end: int, steps: int,
+                index: int) -> List[Crossing]:
+        # crossings of a new segment, fixed at `at` on one axis and going from start to end along the other, with
+        # the other wire's segments perpendicular to it in its strip. the crossing's position comes as
+        # (at, other segment's at)
+        found = []
+        position = bisect_left(others, (min(start, end),))
+        highest = max(start, end)
+        while position < len(others) and others[position][0] <= highest:
+            other_at, low, high, other_start, other_steps, other_index = others[position]
+            if low <= at <= high:
+                found.append((index, other_index, at, other_at,
+                              abs(other_at - start) + steps + abs(at - other_start) + other_steps))
+            position += 1
+        return found
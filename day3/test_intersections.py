@@ -0,0 +1,45 @@
+from random import Random
+from unittest import TestCase
+
+from day3.intersections import crossings
+from day3.main import Line
+
+
+def random_path(random: Random, segments: int, longest: int = 50) -> str:
+    return ','.join(f"{random.choice('UDLR')}{random.randint(0, longest)}" for _ in range(segments))
+
+
+def as_tuples(intercepts):
+    return [(coordinate.x, coordinate.y, steps) for coordinate, steps in intercepts]
+
+
+class TestIntersections(TestCase):
+
+    def assertSameAsScan(self, path_1: str, path_2: str):
+        line_1, line_2 = Line(path_1), Line(path_2)
+        self.assertEqual(as_tuples(line_1.scan_intercepts(line_2)), as_tuples(line_1.get_intercepts(line_2)))
+
+    def test_examples(self):
+        self.assertSameAsScan('R8,U5,L5,D3', 'U7,R6,D4,L4')
+        self.assertSameAsScan('R75,D30,R83,U83,L12,D49,R71,U7,L72', 'U62,R66,U55,R34,D71,R55,D58,R83')
+        self.assertSameAsScan('R98,U47,R26,D63,R33,U87,L62,D20,R33,U53,R51', 'U98,R91,D20,R16,D67,R40,U7,R15,U6,R7')
+
+    def test_example_answers(self):
+        intercepts = Line('R8,U5,L5,D3').get_intercepts(Line('U7,R6,D4,L4'))
+        self.assertEqual(6, min(abs(coordinate.x) + abs(coordinate.y) for coordinate, _ in intercepts))
+        self.assertEqual(30, min(steps for _, steps in intercepts))
+
+    def test_random_wires(self):
+        # random directions, so wires double back over themselves, cross at segment ends and have zero length moves
+        random = Random(3)
+        for _ in range(50):
+            self.assertSameAsScan(random_path(random, 40, 20), random_path(random, 40, 20))
+
+    def test_crossing_order(self):
+        vertical = (True, 0, -5, 0, 5, 0)
+        horizontals = [(False, -5, 1, 5, 1, 0), (False, -5, -1, 5, -1, 0)]
+        self.assertEqual([(0, 0, 0, 1, 11), (0, 1, 0, -1, 9)], crossings([vertical], horizontals))
+        self.assertEqual([(0, 0, 0, 1, 11), (1, 0, 0, -1, 9)], crossings(horizontals, [vertical]))
+
+    def test_parallel_segments_never_cross(self):
+        self.assertEqual([], crossings([(False, 0, 0, 10, 0, 0)], [(False, 5, 0, 20, 0, 0)]))
@@ -0,0 +1,33 @@
+from random import Random
+from unittest import TestCase
+
+from day3.main import Line, Segment, Coordinate, Direction
+from day3.packed import PackedWire
+from day3.test_intersections import random_path
+
+
+class TestPackedWire(TestCase):
+
+    def test_example(self):
+        wire = PackedWire('R8,U5,L5,D3\n')
+        self.assertEqual(4, len(wire))
+        self.assertEqual([(False, 0, 0, 8, 0, 0), (True, 8, 0, 8, 5, 8), (False, 8, 5, 3, 5, 13),
+                          (True, 3, 5, 3, 2, 18)], wire.spans())
+        self.assertEqual(4 + 4 * 5 * 8, wire.nbytes)
+
+    def test_matches_segments(self):
+        random = Random(3)
+        for _ in range(20):
+            path = random_path(random, 50, 1000)
+            self.assertEqual(Line(path).spans(), PackedWire(path).spans())
+            self.assertEqual([(segment.direction in (Direction.UP, Direction.DOWN), segment.start.x, segment.start.y,
+                               segment.end.x, segment.end.y, segment.starting_position_along_line)
+                              for segment in Line(path).segments], PackedWire(path.encode()).spans())
+
+    def test_slotted_geometry(self):
+        segment = Segment(Direction.LEFT, 6, Coordinate(6, -2), 1)
+        self.assertEqual(Coordinate(0, -2), segment.end)
+        with self.assertRaises(AttributeError):
+            segment.colour = 'red'
+        with self.assertRaises(AttributeError):
+            segment.end.z = 0
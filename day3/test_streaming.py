@@ -0,0 +1,71 @@
+from io import BytesIO, StringIO
+from random import Random
+from unittest import TestCase
+
+from day3 import streaming
+from day3.intersections import crossings, spans, closest
+from day3.streaming import read_moves, StreamingCrossings
+from day3.test_intersections import random_path
+
+
+class TestReadMoves(TestCase):
+
+    def test_chunks_split_moves(self):
+        expected = [(0, 'R', 8), (0, 'U', 5), (0, 'L', 5), (0, 'D', 3), (1, 'U', 7), (1, 'R', 6), (1, 'D', 4),
+                    (1, 'L', 4)]
+        text = 'R8,U5,L5,D3\n\nU7,R6,D4,L4\n'
+        for chunk_size in (1, 2, 3, 5, 64):
+            self.assertEqual(expected, list(read_moves(StringIO(text), chunk_size)))
+            self.assertEqual(expected, list(read_moves(BytesIO(text.encode()), chunk_size)))
+        self.assertEqual(expected, list(read_moves([b'R8,U', b'5,L5,D3\nU7,R6', b',D4,L4'])))
+
+
+class TestStreamingCrossings(TestCase):
+
+    def test_example(self):
+        streaming = StreamingCrossings()
+        early = list(streaming.feed(read_moves(StringIO('R8,U5,L5,D3\nU7,R6,D4,L4\n'))))
+        self.assertEqual((6, 30), streaming.closest)
+        self.assertEqual([(11, 30), (6, 30)], early)
+
+    def test_same_as_sweep_in_any_order(self):
+        random = Random(13)
+        for _ in range(30):
+            paths = [random_path(random, 40, 20), random_path(random, 40, 20)]
+            moves = [(wire, move[0], int(move[1:])) for wire in (0, 1) for move in paths[wire].split(',')]
+            expected = crossings(spans(paths[0]), spans(paths[1]))
+            first, second = [move for move in moves if move[0] == 0], [move for move in moves if move[0] == 1]
+            # any interleaving of the two wires, keeping each wire's own moves in order
+            interleaved = []
+            while first or second:
+                interleaved.append((first if first and (not second or random.random() < 0.5) else second).pop(0))
+            streaming = StreamingCrossings()
+            found = []
+            for wire, direction, length in interleaved:
+                found.extend(streaming.add(wire, direction, length))
+            self.assertEqual(expected, sorted(found))
+            self.assertEqual(closest(expected), streaming.closest)
+            self.assertEqual(len(expected), streaming.crossings_found)
+            self.assertEqual(40, streaming.segments(1))
+
+    def test_segments_across_strips(self):
+        random = Random(17)
+        original_width = streaming.STRIP_WIDTH
+        streaming.STRIP_WIDTH = 4
+        try:
+            for _ in range(10):
+                paths = [random_path(random, 60, 30), random_path(random, 60, 30)]
+                crossings_found = StreamingCrossings()
+                found = [crossing for move in read_moves(['\n'.join(paths)]) for crossing in crossings_found.add(*move)]
+                self.assertEqual(crossings(spans(paths[0]), spans(paths[1])), sorted(found))
+        finally:
+            streaming.STRIP_WIDTH = original_width
+
+    def test_no_crossings(self):
+        streaming = StreamingCrossings()
+        self.assertEqual([], list(streaming.feed(read_moves(['R5,U5\nL5,D5']))))
+        self.assertIsNone(streaming.closest)
+
+    def test_only_two_wires(self):
+        with self.assertRaises(RuntimeError):
+            StreamingCrossings().add(2, 'U', 1)
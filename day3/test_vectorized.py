@@ -0,0 +1,44 @@
+from random import Random
+from unittest import TestCase, skipUnless
+
+from day3.intersections import spans
+from day3.main import Line
+from day3.test_intersections import random_path
+from day3.vectorized import closest_crossing, WireArrays, np
+
+
+def closest_by_scan(path_1: str, path_2: str):
+    # every pair of segments, without dropping the first intercept like scan_intercepts does
+    intercepts = [found[1:] for found in (segment_1.intersect(segment_2) for segment_1 in Line(path_1).segments
+                                          for segment_2 in Line(path_2).segments) if found[0] and found[2] > 0]
+    if len(intercepts) == 0:
+        return None
+    return min(abs(coordinate.x) + abs(coordinate.y) for coordinate, _ in intercepts), \
+        min(steps for _, steps in intercepts)
+
+
+class TestVectorized(TestCase):
+
+    def test_examples(self):
+        self.assertEqual((6, 30), closest_crossing('R8,U5,L5,D3', 'U7,R6,D4,L4'))
+        self.assertEqual((159, 610), Line('R75,D30,R83,U83,L12,D49,R71,U7,L72').closest_intercept(
+            Line('U62,R66,U55,R34,D71,R55,D58,R83')))
+        self.assertEqual((135, 410), closest_crossing('R98,U47,R26,D63,R33,U87,L62,D20,R33,U53,R51',
+                                                      'U98,R91,D20,R16,D67,R40,U7,R15,U6,R7'))
+
+    def test_random_wires(self):
+        random = Random(5)
+        for _ in range(50):
+            path_1, path_2 = random_path(random, 40, 20), random_path(random, 40, 20)
+            self.assertEqual(closest_by_scan(path_1, path_2), closest_crossing(path_1, path_2, tile=7))
+
+    def test_no_crossings(self):
+        self.assertIsNone(closest_crossing('R5,U5', 'L5,D5'))
+
+    @skipUnless(np is not None, 'numpy is not installed')
+    def test_arrays_match_spans(self):
+        path = 'R8,U5,L5,D3\n'
+        arrays = WireArrays(path)
+        self.assertEqual(spans(path), [(bool(v), int(x1), int(y1), int(x2), int(y2), int(s)) for v, x1, y1, x2, y2, s
+                                       in zip(arrays.vertical, arrays.x1, arrays.y1, arrays.x2, arrays.y2,
+                                              arrays.steps)])
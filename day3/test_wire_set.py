@@ -0,0 +1,54 @@
+from random import Random
+from unittest import TestCase
+
+from day3 import wire_set
+from day3.intersections import crossings, spans, closest
+from day3.test_intersections import random_path
+from day3.wire_set import WireSet
+
+EXAMPLE = ['R8,U5,L5,D3\n', 'U7,R6,D4,L4\n', 'L3,U2,R9\n']
+
+
+class TestWireSet(TestCase):
+
+    def assertSameAsPairs(self, wires: WireSet):
+        for first in range(len(wires)):
+            for second in range(len(wires)):
+                if first != second:
+                    expected = crossings(spans(wires.paths[first]), spans(wires.paths[second]))
+                    self.assertEqual(expected, wires.crossings(first, second))
+                    self.assertEqual(closest(expected), wires.closest(first, second))
+
+    def test_example(self):
+        wires = WireSet(EXAMPLE)
+        self.assertEqual(3, len(wires))
+        self.assertEqual((6, 30), wires.closest(0, 1))
+        self.assertSameAsPairs(wires)
+
+    def test_all_closest(self):
+        wires = WireSet(EXAMPLE)
+        found = wires.all_closest()
+        self.assertEqual({(0, 1), (0, 2), (1, 2)}, set(found))
+        self.assertEqual(min(found.values(), key=lambda best: best[1])[1], wires.fewest_combined_steps()[1])
+
+    def test_random_wires(self):
+        random = Random(7)
+        self.assertSameAsPairs(WireSet([random_path(random, 30, 20) for _ in range(6)]))
+
+    def test_parallel_slabs(self):
+        random = Random(11)
+        paths = [random_path(random, 60, 30) for _ in range(5)]
+        original_threshold = wire_set.PARALLEL_THRESHOLD
+        wire_set.PARALLEL_THRESHOLD = 0
+        try:
+            parallel = WireSet(paths, workers=3)
+            self.assertEqual(WireSet(paths, workers=1).all_closest(), parallel.all_closest())
+            self.assertSameAsPairs(parallel)
+        finally:
+            wire_set.PARALLEL_THRESHOLD = original_threshold
+
+    def test_no_crossings(self):
+        wires = WireSet(['R5,U5', 'L5,D5'])
+        self.assertEqual({}, wires.all_closest())
+        self.assertIsNone(wires.fewest_combined_steps())
+        self.assertEqual([], wires.crossings(1, 0))
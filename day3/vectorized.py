@@ -0,0 +1,73 @@
+import re
+from typing import Optional, Tuple
+
+from day3.intersections import crossings, spans, closest
+
+try:
+    import numpy as np
+except ImportError:
+    # without numpy closest_crossing sweeps the spans instead
+    np = None
+
+# how many segments of each wire are checked against each other at a time, bounding the size of the masks built
+TILE = 1024
+# fills the cells of a tile where the segments don't cross, so they never come out as the minimum
+__NONE = 2 ** 63 - 1
+
+
+class WireArrays:
+    # a wire's segments as columns of arrays, parsed straight from its path
+    vertical: 'np.ndarray'
+    x1: 'np.ndarray'
+    y1: 'np.ndarray'
+    x2: 'np.ndarray'
+    y2: 'np.ndarray'
+    steps: 'np.ndarray'
+
+    def __init__(self, path: str):
+        directions = np.frombuffer(re.sub(r'[^UDLR]', '', path).encode(), dtype=np.uint8)
+        lengths = np.array(re.sub(r'[UDLR\s]', '', path).split(','), dtype=np.int64)
+        dx = np.where(directions == ord('R'), lengths, np.where(directions == ord('L'), -lengths, 0))
+        dy = np.where(directions == ord('U'), lengths, np.where(directions == ord('D'), -lengths, 0))
+        self.vertical = (directions == ord('U')) | (directions == ord('D'))
+        self.x2, self.y2 = np.cumsum(dx), np.cumsum(dy)
+        self.x1, self.y1 = self.x2 - dx, self.y2 - dy
+        self.steps = np.cumsum(lengths) - lengths
+
+    def select(self, vertical: bool) -> Tuple['np.ndarray', ...]:
+        chosen = self.vertical if vertical else ~self.vertical
+        return self.x1[chosen], self.y1[chosen], self.x2[chosen], self.y2[chosen], self.steps[chosen]
+
+
+def closest_crossing(first: str, second: str, tile: int = TILE) -> Optional[Tuple[int, int]]:
+    # the smallest manhattan distance from the origin and the fewest combined steps to any crossing of two wires
+    if np is None:
+        return closest(crossings(spans(first), spans(second)))
+    first_arrays, second_arrays = WireArrays(first), WireArrays(second)
+    found = [best for best in (__closest(first_arrays.select(True), second_arrays.select(False), tile),
+                               __closest(second_arrays.select(True), first_arrays.select(False), tile))
+             if best is not None]
+    if len(found) == 0:
+        return None
+    return min(distance for distance, _ in found), min(steps for _, steps in found)
+
+
+def __closest(verticals: Tuple['np.ndarray', ...], horizontals: Tuple['np.ndarray', ...],
+              tile: int) -> Optional[Tuple[int, int]]:
+    best_distance, best_steps = None, None
+    for v in range(0, len(verticals[0]), tile):
+        vx, vy1, _, vy2, v_steps = (column[v:v + tile, None] for column in verticals)
+        v_low, v_high = np.minimum(vy1, vy2), np.maximum(vy1, vy2)
+        for h in range(0, len(horizontals[0]), tile):
+            hx1, hy, hx2, _, h_steps = (column[None, h:h + tile] for column in horizontals)
+            crossed = (v_low <= hy) & (hy <= v_high) & (np.minimum(hx1, hx2) <= vx) & (vx <= np.maximum(hx1, hx2))
+            steps = np.abs(hy - vy1) + v_steps + np.abs(vx - hx1) + h_steps
+            # where both wires start doesn't count as a crossing
+            crossed &= steps > 0
+            if not crossed.any():
+                continue
+            distance = int(np.where(crossed, np.abs(vx) + np.abs(hy), __NONE).min())
+            fewest = int(np.where(crossed, steps, __NONE).min())
+            best_distance = distance if best_distance is None else min(best_distance, distance)
+            best_steps = fewest if best_steps is None else min(best_steps, fewest)
+    return None if best_distance is None else (best_distance, best_steps)
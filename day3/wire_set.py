@@ -0,0 +1,109 @@
+import logging as log
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, Iterable, Any
+
+from day3.intersections import Span, Crossing, spans, sweep, closest
+
+# two wires, by their number in the set, lowest first
+Pair = Tuple[int, int]
+Tagged = Tuple[Tuple[int, int], Span]
+# fewer vertical segments than this are swept in process, starting workers would take longer than the sweep
+PARALLEL_THRESHOLD = 20000
+
+
+def sweep_slab(verticals: List[Tagged], horizontals: List[Tagged]) -> Dict[Pair, List[Crossing]]:
+    # runs in the worker processes: every crossing between different wires among the given segments, by pair
+    found: Dict[Pair, List[Crossing]] = {}
+    for (vertical_wire, vertical_index), (horizontal_wire, horizontal_index), x, y, steps \
+            in sweep(verticals, horizontals):
+        if vertical_wire < horizontal_wire:
+            found.setdefault((vertical_wire, horizontal_wire), []).append(
+                (vertical_index, horizontal_index, x, y, steps))
+        elif horizontal_wire < vertical_wire:
+            found.setdefault((horizontal_wire, vertical_wire), []).append(
+                (horizontal_index, vertical_index, x, y, steps))
+    return found
+
+
+class WireSet:
+    # every wire's segments go in to one index, which a single sweep finds the crossings of every pair of wires in.
+    # the sweep is split in to slabs along x, which are swept in parallel
+    logger = log.getLogger('WireSet')
+    paths: List[str]
+    workers: int
+    __spans: List[List[Span]]
+    __crossings: Optional[Dict[Pair, List[Crossing]]]
+
+    def __init__(self, paths: Iterable[str], workers: Optional[int] = None):
+        self.paths = [path.strip() for path in paths if len(path.strip()) > 0]
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.__spans = [spans(path) for path in self.paths]
+        self.__crossings = None
+
+    def __len__(self):
+        return len(self.paths)
+
+    def crossings(self, first: int, second: int) -> List[Crossing]:
+        # the same crossings, in the same order, as intersections.crossings for the two wires on their own
+        if first > second:
+            return sorted((j, i, x, y, steps) for i, j, x, y, steps in self.crossings(second, first))
+        return list(self.__index().get((first, second), []))
+
+    def closest(self, first: int, second: int) -> Optional[Tuple[int, int]]:
+        return closest(self.crossings(first, second))
+
+    def all_closest(self) -> Dict[Pair, Tuple[int, int]]:
+        # the smallest manhattan distance and fewest combined steps, for every pair of wires that cross
+        found = {pair: closest(pair_crossings) for pair, pair_crossings in self.__index().items()}
+        return {pair: best for pair, best in found.items() if best is not None}
+
+    def fewest_combined_steps(self) -> Optional[Tuple[Pair, int]]:
+        found = self.all_closest()
+        if len(found) == 0:
+            return None
+        pair = min(found, key=lambda crossing_pair: (found[crossing_pair][1], crossing_pair))
+        return pair, found[pair][1]
+
+    def __index(self) -> Dict[Pair, List[Crossing]]:
+        if self.__crossings is None:
+            self.__crossings = self.__sweep()
+        return self.__crossings
+
+    def __sweep(self) -> Dict[Pair, List[Crossing]]:
+        verticals = [((wire, index), span) for wire, wire_spans in enumerate(self.__spans)
+                     for index, span in enumerate(wire_spans) if span[0]]
+        horizontals = [((wire, index), span) for wire, wire_spans in enumerate(self.__spans)
+                       for index, span in enumerate(wire_spans) if not span[0]]
+        slabs = WireSet.__slabs(verticals, horizontals,
+                                1 if len(verticals) < PARALLEL_THRESHOLD else max(self.workers, 1))
+        self.logger.debug('Sweeping %s wires in %s slabs', len(self.paths), len(slabs))
+        if len(slabs) == 1:
+            swept = [sweep_slab(*slabs[0])]
+        else:
+            with ProcessPoolExecutor(len(slabs)) as executor:
+                swept = list(executor.map(sweep_slab, *zip(*slabs)))
+        found: Dict[Pair, List[Crossing]] = {}
+        for slab in swept:
+            for pair, pair_crossings in slab.items():
+                found.setdefault(pair, []).extend(pair_crossings)
+        for pair_crossings in found.values():
+            pair_crossings.sort()
+        return found
+
+    @staticmethod
+    def __slabs(verticals: List[Tagged], horizontals: List[Tagged], count: int) -> List[Tuple[Any, Any]]:
+        # every vertical goes in exactly one slab, so no crossing is found twice. a horizontal goes in every slab
+        # it reaches in to
+        if count == 1:
+            return [(verticals, horizontals)]
+        verticals = sorted(verticals, key=lambda tagged: tagged[1][1])
+        size = -(-len(verticals) // count)
+        slabs = []
+        for start in range(0, len(verticals), size):
+            slab_verticals = verticals[start:start + size]
+            low, high = slab_verticals[0][1][1], slab_verticals[-1][1][1]
+            slabs.append((slab_verticals, [tagged for tagged in horizontals
+                                           if min(tagged[1][1], tagged[1][3]) <= high
+                                           and max(tagged[1][1], tagged[1][3]) >= low]))
+        return slabs
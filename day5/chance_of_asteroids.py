@@ -1,12 +1,12 @@
-from typing import List
 import logging as log
 
+from shared.int_code_computers.loader import load
 from shared.int_code_computers.program import Program
-from shared.utils import IO
+from shared.int_code_computers.state import ArrayMemory
 
 
 def part1():
-    program_code: List[int] = IO.read_as_one_line(lambda line: list(map(int, line.split(","))))
+    program_code: ArrayMemory = load('input.txt')
     program = Program(program_code)
     program.print_instructions()
     program.run()
@@ -0,0 +1,69 @@
+import logging as log
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import List, Tuple, Iterable, Iterator, Optional, Sequence
+
+from shared.int_code_computers.channels import IterableInput, CollectingOutput
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.state import State
+
+# the program image each worker process runs its jobs against, set once by the pool's initializer
+__worker_image: Optional[List[int]] = None
+__LOGGER = log.getLogger('Batch')
+
+
+class JobResult:
+    job_id: int
+    inputs: Tuple[int, ...]
+    outputs: List[int]
+    result: Optional[int]
+    status: Optional[Status]
+    error: Optional[str]
+
+    def __init__(self, job_id: int, inputs: Tuple[int, ...], outputs: List[int], result: Optional[int],
+                 status: Optional[Status], error: Optional[str] = None):
+        self.job_id = job_id
+        self.inputs = inputs
+        self.outputs = outputs
+        self.result = result
+        self.status = status
+        self.error = error
+
+    def __repr__(self):
+        return f'Job {self.job_id}: inputs: {self.inputs}, outputs: {self.outputs}, result: {self.result}, ' \
+               f'status: {self.status}' + (f', error: {self.error}' if self.error else '')
+
+
+def run_job(image: Sequence[int], job_id: int, inputs: Tuple[int, ...]) -> JobResult:
+    outputs = CollectingOutput()
+    program = Program.from_state(State(list(image), inputs=IterableInput(inputs), outputs=outputs))
+    try:
+        result = program.run()
+    except (RuntimeError, TypeError, IndexError) as e:
+        # a job that crashes the program is reported, rather than taking the rest of the batch down with it
+        return JobResult(job_id, inputs, outputs.values, None, None, repr(e))
+    return JobResult(job_id, inputs, outputs.values, result, program.status)
+
+
+def __load_image(image: List[int]) -> None:
+    global __worker_image
+    __worker_image = image
+
+
+def __run_jobs(jobs: List[Tuple[int, Tuple[int, ...]]]) -> List[JobResult]:
+    return [run_job(__worker_image, job_id, inputs) for job_id, inputs in jobs]
+
+
+def run_batch(image: Sequence[int], jobs: Iterable[Sequence[int]], workers: Optional[int] = None,
+              chunk_size: int = 64) -> Iterator[JobResult]:
+    # results are yielded as soon as their chunk of jobs completes, so not necessarily in the order given
+    numbered_jobs = ((job_id, tuple(inputs)) for job_id, inputs in enumerate(jobs))
+    with ProcessPoolExecutor(workers, initializer=__load_image, initargs=(list(image),)) as executor:
+        futures = []
+        chunk = list(islice(numbered_jobs, chunk_size))
+        while len(chunk) > 0:
+            futures.append(executor.submit(__run_jobs, chunk))
+            chunk = list(islice(numbered_jobs, chunk_size))
+        __LOGGER.debug('Submitted %s chunks of up to %s jobs', len(futures), chunk_size)
+        for future in as_completed(futures):
+            yield from future.result()
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging as log
+import os
+import weakref
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple, Sequence
+
+from shared.int_code_computers.channels import InputSource, OutputSink, Channel
+from shared.int_code_computers.state import State, ArrayMemory, CopyOnWriteMemory
+
+# an image is hashed with one digest over its packed cells. writes after that are added on as the difference
+# between per cell hashes, so a cell can be rehashed on its own when it changes
+HASH_BITS = 128
+# digests of copy on write bases, which are never modified, by id. dropped along with the base
+__BASE_HASHES: Dict[int, int] = {}
+
+
+def cell_hash(address: int, value: int) -> int:
+    # zero cells hash to zero, so memory that grew (zero filled) hashes the same as before it grew
+    if value == 0:
+        return 0
+    return int.from_bytes(hashlib.blake2b(f'{address}:{value}'.encode(), digest_size=HASH_BITS // 8).digest(),
+                          'little')
+
+
+def memory_hash(memory: Sequence[int]) -> int:
+    if isinstance(memory, CopyOnWriteMemory):
+        base = memory.base
+        hashed = __base_hash(base) + sum(cell_hash(address, value) -
+                                         cell_hash(address, base[address] if address < len(base) else 0)
+                                         for address, value in memory.changes().items())
+    elif isinstance(memory, ArrayMemory):
+        hashed = image_hash(memory.cells) + sum(cell_hash(address, value) for address, value in memory.sparse.items())
+    else:
+        hashed = image_hash(memory)
+    return hashed % 2 ** HASH_BITS
+
+
+def image_hash(cells: Sequence[int]) -> int:
+    # trailing zeros are left out, so memory that grew (zero filled) hashes the same as before it grew
+    try:
+        packed = b'q' + (cells if isinstance(cells, array) else array('q', cells)).tobytes().rstrip(b'\x00')
+    except OverflowError:
+        values = list(cells)
+        while len(values) > 0 and values[-1] == 0:
+            values.pop()
+        packed = b'r' + repr(values).encode()
+    return int.from_bytes(hashlib.blake2b(packed, digest_size=HASH_BITS // 8).digest(), 'little')
+
+
+def __base_hash(base: Sequence[int]) -> int:
+    if not isinstance(base, array):
+        return image_hash(base)
+    hashed = __BASE_HASHES.get(id(base))
+    if hashed is None:
+        hashed = __BASE_HASHES[id(base)] = image_hash(base)
+        weakref.finalize(base, __BASE_HASHES.pop, id(base), None)
+    return hashed
+
+
+class HashedState(State):
+    # the memory hash is taken once up front. after that only the cells written since it was last asked for are
+    # rehashed
+    __hash: int
+    # address -> value it held when the hash was last brought up to date
+    __written: Dict[int, int]
+
+    def __init__(self, memory: List[int], start_index=0, inputs: InputSource = None, outputs: OutputSink = None):
+        super().__init__(memory, start_index, inputs, outputs)
+        self.__hash = memory_hash(memory)
+        self.__written = {}
+
+    def assign(self, at: int, data: int):
+        if at not in self.__written:
+            self.__written[at] = self.memory[at]
+        super().assign(at, data)
+
+    def fork(self):
+        state = super().fork()
+        state.__written = dict(self.__written)
+        return state
+
+    @property
+    def written(self) -> List[int]:
+        return list(self.__written)
+
+    def memory_hash(self) -> int:
+        memory = self.memory
+        for address, previous in self.__written.items():
+            self.__hash += cell_hash(address, memory[address]) - cell_hash(address, previous)
+        self.__hash %= 2 ** HASH_BITS
+        self.__written.clear()
+        return self.__hash
+
+
+class RecordingOutput(OutputSink):
+    # passes every output on, while keeping a copy of it
+    values: List[int]
+
+    def __init__(self, outputs: OutputSink):
+        self.values = []
+        self.__outputs = outputs
+
+    def write(self, value: int) -> None:
+        self.values.append(value)
+        self.__outputs.write(value)
+
+
+class CachedRun(NamedTuple):
+    # everything a run to the halt did: the final values of the cells it wrote, what it read & wrote, where it stopped
+    changes: Tuple[Tuple[int, int], ...]
+    outputs: Tuple[int, ...]
+    consumed: int
+    index: int
+    instructions: int
+
+    def replay(self, state: State) -> None:
+        for address, value in self.changes:
+            state.assign(address, value)
+        for _ in range(self.consumed):
+            state.inputs.read()
+        for value in self.outputs:
+            state.outputs.write(value)
+        state.index = self.index
+
+
+class ResultCache:
+    logger = log.getLogger('ResultCache')
+    capacity: int
+    # when set, runs are also kept as files in here, which outlive the process
+    directory: Optional[str]
+    hits: int
+    misses: int
+    __entries: 'OrderedDict[str, CachedRun]'
+
+    def __init__(self, capacity: int = 256, directory: str = None):
+        self.capacity = capacity
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(state: State) -> Optional[str]:
+        # None when the run can't be keyed: the memory isn't hashed, or the inputs can't be known before running
+        if not isinstance(state, HashedState) or not isinstance(state.inputs, Channel):
+            return None
+        keyed = (state.memory_hash(), state.mem_length, state.index, tuple(state.inputs.values))
+        return hashlib.sha1(repr(keyed).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedRun]:
+        run = self.__entries.get(key)
+        if run is not None:
+            self.__entries.move_to_end(key)
+        elif self.directory is not None:
+            run = self.__read(key)
+            if run is not None:
+                self.__remember(key, run)
+        if run is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return run
+
+    def put(self, key: str, run: CachedRun) -> None:
+        self.__remember(key, run)
+        if self.directory is not None:
+            self.__write(key, run)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __remember(self, key: str, run: CachedRun) -> None:
+        self.__entries[key] = run
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.capacity:
+            evicted, _ = self.__entries.popitem(last=False)
+            self.logger.debug('Evicted run %s', evicted)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def __read(self, key: str) -> Optional[CachedRun]:
+        try:
+            with open(self.__path(key), 'r') as source:
+                saved = json.load(source)
+        except FileNotFoundError:
+            return None
+        return CachedRun(tuple((address, value) for address, value in saved['changes']), tuple(saved['outputs']),
+                         saved['consumed'], saved['index'], saved['instructions'])
+
+    def __write(self, key: str, run: CachedRun) -> None:
+        # written next to its path first, so other processes never read half a file
+        temporary = f'{self.__path(key)}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as target:
+            json.dump(run._asdict(), target)
+        os.replace(temporary, self.__path(key))
@@ -0,0 +1,101 @@
+import asyncio
+import logging as log
+from abc import abstractmethod
+from collections import deque
+from typing import Iterable, Deque, Generator, List, Any
+
+
+class AwaitingInput(Exception):
+    # raised by an input source with nothing to read yet: the program pauses, and resumes when run again
+    pass
+
+
+class InputSource:
+    @abstractmethod
+    def read(self) -> int:
+        pass
+
+
+class OutputSink:
+    @abstractmethod
+    def write(self, value: int) -> None:
+        pass
+
+
+class ConsoleInput(InputSource):
+    def read(self) -> int:
+        return int(input("Input: "))
+
+
+class LoggingOutput(OutputSink):
+    __logger = log.getLogger('OutputOperation')
+
+    def write(self, value: int) -> None:
+        self.__logger.info("Output operation, val: %s", value)
+
+
+class IterableInput(InputSource):
+    def __init__(self, values: Iterable[int]):
+        self.__values = iter(values)
+
+    def read(self) -> int:
+        try:
+            return next(self.__values)
+        except StopIteration:
+            raise AwaitingInput()
+
+
+class Channel(InputSource, OutputSink):
+    # a queue between the program writing to it and the program (or caller) reading from it
+    values: Deque[int]
+
+    def __init__(self, values: Iterable[int] = ()):
+        self.values = deque(values)
+
+    def read(self) -> int:
+        if len(self.values) == 0:
+            raise AwaitingInput()
+        return self.values.popleft()
+
+    def write(self, value: int) -> None:
+        self.values.append(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class CollectingOutput(OutputSink):
+    values: List[int]
+
+    def __init__(self):
+        self.values = []
+
+    def write(self, value: int) -> None:
+        self.values.append(value)
+
+
+class CoroutineOutput(OutputSink):
+    # sends every output in to a generator, which is primed on construction
+    def __init__(self, coroutine: Generator[Any, int, Any]):
+        self.__coroutine = coroutine
+        next(self.__coroutine)
+
+    def write(self, value: int) -> None:
+        self.__coroutine.send(value)
+
+
+class AsyncQueueChannel(InputSource, OutputSink):
+    # reads never block the event loop: an empty queue pauses the program instead
+    queue: asyncio.Queue
+
+    def __init__(self, queue: asyncio.Queue = None):
+        self.queue = asyncio.Queue() if queue is None else queue
+
+    def read(self) -> int:
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            raise AwaitingInput()
+
+    def write(self, value: int) -> None:
+        self.queue.put_nowait(value)
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import struct
+from typing import List, Sequence, Tuple, Dict
+
+from shared.int_code_computers.channels import ConsoleInput, LoggingOutput, Channel, CollectingOutput
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.state import State, ArrayMemory, CopyOnWriteMemory, freeze
+
+# a checkpoint is: magic, payload length, the fingerprint of the image the memory is a delta against, then the payload.
+# the payload is variable length (zig-zag) encoded ints: registers, memory as (address gap, value) pairs for only the
+# cells that differ from the image, then the values still queued on the input and output
+__HEADER = struct.Struct('<4sQ20s')
+__MAGIC = b'ICK1'
+__STATUSES = list(Status)
+# memory kinds
+__LIST, __ARRAY, __COPY_ON_WRITE, __GROWING_COPY_ON_WRITE = 0, 1, 2, 3
+# input & output kinds. anything else can't be checkpointed: its pending values can't be read without consuming them
+__CONSOLE, __LOGGING, __CHANNEL, __COLLECTING = 0, 1, 2, 3
+
+
+def fingerprint(image: Sequence[int]) -> bytes:
+    return hashlib.sha1(','.join(map(str, image)).encode()).digest()
+
+
+def __write_int(target: bytearray, value: int) -> None:
+    value = value * 2 if value >= 0 else -value * 2 - 1
+    while value > 0x7f:
+        target.append(value & 0x7f | 0x80)
+        value >>= 7
+    target.append(value)
+
+
+def __read_int(data: bytes, offset: int) -> Tuple[int, int]:
+    value, shift = 0, 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return (value >> 1 if value % 2 == 0 else -(value + 1 >> 1)), offset
+
+
+def __delta(memory, image: Sequence[int]) -> Dict[int, int]:
+    image_length = len(image)
+    changed = {address: value for address, value in enumerate(memory)
+               if value != (image[address] if address < image_length else 0)}
+    if isinstance(memory, ArrayMemory):
+        changed.update(memory.sparse)
+    elif isinstance(memory, CopyOnWriteMemory):
+        changed.update({address: value for address, value in memory.changes().items() if address >= len(memory)})
+    return changed
+
+
+def __pending(channel, kinds: Dict[type, int]) -> Tuple[int, List[int]]:
+    kind = kinds.get(type(channel))
+    if kind is None:
+        raise RuntimeError(f'Can not checkpoint a program using a {type(channel).__name__}')
+    return kind, list(getattr(channel, 'values', ()))
+
+
+def dumps(program: Program, image: Sequence[int] = ()) -> bytes:
+    # pass the image the program was loaded from, and only the cells it changed since are stored
+    state = program.state
+    memory = state.memory
+    if isinstance(memory, CopyOnWriteMemory):
+        memory_kind = __GROWING_COPY_ON_WRITE if memory.grows else __COPY_ON_WRITE
+    else:
+        memory_kind = __ARRAY if isinstance(memory, ArrayMemory) else __LIST
+    payload = bytearray()
+    for value in (__STATUSES.index(program.status), program.instructions_executed, state.index, memory_kind,
+                  len(memory)):
+        __write_int(payload, value)
+    changed = __delta(memory, image)
+    __write_int(payload, len(changed))
+    previous = 0
+    for address in sorted(changed):
+        __write_int(payload, address - previous)
+        __write_int(payload, changed[address])
+        previous = address
+    for kind, values in (__pending(state.inputs, {ConsoleInput: __CONSOLE, Channel: __CHANNEL}),
+                         __pending(state.outputs, {LoggingOutput: __LOGGING, Channel: __CHANNEL,
+                                                   CollectingOutput: __COLLECTING})):
+        __write_int(payload, kind)
+        __write_int(payload, len(values))
+        for value in values:
+            __write_int(payload, value)
+    return __HEADER.pack(__MAGIC, len(payload), fingerprint(image)) + bytes(payload)
+
+
+def __channel(kind: int, values: List[int]):
+    if kind == __CONSOLE:
+        return ConsoleInput()
+    if kind == __LOGGING:
+        return LoggingOutput()
+    if kind == __CHANNEL:
+        return Channel(values)
+    channel = CollectingOutput()
+    channel.values = values
+    return channel
+
+
+def loads(data: bytes, image: Sequence[int] = ()) -> Program:
+    magic, length, image_fingerprint = __HEADER.unpack_from(data)
+    if magic != __MAGIC:
+        raise RuntimeError('Data does not hold an Intcode checkpoint')
+    if image_fingerprint != fingerprint(image):
+        raise RuntimeError('Checkpoint was not taken against the given image')
+    payload = data[__HEADER.size:__HEADER.size + length]
+    if len(payload) != length:
+        raise RuntimeError('Checkpoint is truncated')
+    offset = 0
+    registers = []
+    for _ in range(6):
+        value, offset = __read_int(payload, offset)
+        registers.append(value)
+    status, instructions_executed, index, memory_kind, memory_length, changed = registers
+    cells = list(image[:memory_length]) + [0] * (memory_length - len(image))
+    address = 0
+    sparse = {}
+    for _ in range(changed):
+        gap, offset = __read_int(payload, offset)
+        value, offset = __read_int(payload, offset)
+        address += gap
+        if address < memory_length:
+            cells[address] = value
+        else:
+            sparse[address] = value
+    channels = []
+    for _ in range(2):
+        kind, offset = __read_int(payload, offset)
+        count, offset = __read_int(payload, offset)
+        values = []
+        for _ in range(count):
+            value, offset = __read_int(payload, offset)
+            values.append(value)
+        channels.append(__channel(kind, values))
+    if memory_kind == __ARRAY:
+        memory = ArrayMemory(cells)
+        memory.sparse = sparse
+    elif memory_kind in (__COPY_ON_WRITE, __GROWING_COPY_ON_WRITE):
+        base = freeze(image if len(image) == memory_length else cells)
+        overlay = {address: value for address, value in enumerate(cells) if value != base[address]}
+        overlay.update(sparse)
+        memory = CopyOnWriteMemory(base, overlay, grows=memory_kind == __GROWING_COPY_ON_WRITE)
+    else:
+        memory = cells
+    program = Program.from_state(State(memory, index, *channels))
+    program.status = __STATUSES[status]
+    program.instructions_executed = instructions_executed
+    return program
+
+
+def save(program: Program, path: str, image: Sequence[int] = ()) -> None:
+    # written next to the path first, so a crash while saving never leaves a half written checkpoint behind
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as target:
+        target.write(dumps(program, image))
+        target.flush()
+        os.fsync(target.fileno())
+    os.replace(temporary, path)
+
+
+def restore(path: str, image: Sequence[int] = ()) -> Program:
+    with open(path, 'rb') as source:
+        return loads(source.read(), image)
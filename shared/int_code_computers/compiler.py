@@ -0,0 +1,196 @@
+import logging as log
+from functools import lru_cache
+from typing import List, Dict, Tuple, Callable, Optional
+
+from shared.int_code_computers.operations import AddOperation, MultiplyOperation, LessThanOperation, \
+    EqualsOperation, JumpIfTrueOperation, JumpIfFalseOperation, Operation, POSITION_MODE, IMMEDIATE_MODE
+from shared.int_code_computers.channels import InputSource, OutputSink, AwaitingInput
+from shared.int_code_computers.control_flow import ControlFlowGraph
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.state import State
+
+# a translated block takes (memory, guard, invalidate, memory length) and returns the index execution continues from &
+# how many operations it ran
+Block = Callable[[List[int], bytearray, Callable[[int], None], int], Tuple[int, int]]
+
+MAX_BLOCK_LENGTH = 64
+__EXPRESSIONS = {
+    AddOperation: '{0} + {1}',
+    MultiplyOperation: '{0} * {1}',
+    LessThanOperation: '1 if {0} < {1} else 0',
+    EqualsOperation: '1 if {0} == {1} else 0',
+}
+__CONDITIONS = {
+    JumpIfTrueOperation: '{0} != 0',
+    JumpIfFalseOperation: '{0} == 0',
+}
+
+
+def __operand(index: int, input_number: int, modes: Tuple[int, ...]) -> Tuple[Optional[str], str]:
+    # parameters are always read at run time, so writes to them never invalidate a translation. returns the name the
+    # address is read in to, for position mode
+    if modes[input_number - 1] == IMMEDIATE_MODE:
+        return None, f'm[{index + input_number}]'
+    return f'a{input_number}', f'm[a{input_number}]'
+
+
+def is_translatable(op: Operation, modes: Tuple[int, ...]) -> bool:
+    return (type(op) in __EXPRESSIONS or type(op) in __CONDITIONS) \
+           and all(mode in (POSITION_MODE, IMMEDIATE_MODE) for mode in modes)
+
+
+@lru_cache(maxsize=4096)
+def translate_block(start: int, op_values: Tuple[int, ...]) -> Block:
+    # the translation only depends on where the block starts and the op codes (with modes) in it
+    lines = ['def block(m, g, inv, n):']
+    index = start
+    for executed, op_value in enumerate(op_values):
+        op, modes = Program.op_factory.decode(op_value)
+        operands = [__operand(index, input_number, modes)
+                    for input_number in range(1, op.op_length if op.writes_to is None else op.writes_to)]
+        addresses = [(name, index + input_number) for input_number, (name, _) in enumerate(operands, 1)
+                     if name is not None]
+        if type(op) in __EXPRESSIONS:
+            addresses.append(('d', index + 3))
+        if len(addresses) > 0:
+            # an address outside memory hands the operation back to the interpreter, which has get_input's rules for it
+            lines += [f'    {name} = m[{parameter}]' for name, parameter in addresses]
+            lines += [f'    if not ({" and ".join(f"0 <= {name} < n" for name, _ in addresses)}):',
+                      f'        return {index}, {executed}']
+        inputs = [operand for _, operand in operands]
+        next_index = op.next_op_start(index)
+        if type(op) in __EXPRESSIONS:
+            lines += [f'    m[d] = {__EXPRESSIONS[type(op)].format(*inputs)}',
+                      '    if d < len(g) and g[d]:',
+                      '        inv(d)',
+                      f'        return {next_index}, {executed + 1}']
+        else:
+            lines += [f'    if {__CONDITIONS[type(op)].format(*inputs)}:',
+                      f'        return {inputs[1]}, {executed + 1}']
+        index = next_index
+    lines.append(f'    return {index}, {len(op_values)}')
+    namespace = {}
+    exec(compile('\n'.join(lines), f'<intcode block at {start}>', 'exec'), namespace)
+    return namespace['block']
+
+
+class GuardedState(State):
+    # writes made by the interpreter (i.e. input operations) also have to invalidate translated code
+    guard: bytearray
+    on_code_write: Callable[[int], None]
+
+    def __init__(self, memory: List[int], guard: bytearray, on_code_write: Callable[[int], None], start_index=0,
+                 inputs: InputSource = None, outputs: OutputSink = None):
+        super().__init__(memory, start_index, inputs, outputs)
+        self.guard = guard
+        self.on_code_write = on_code_write
+
+    def assign(self, at: int, data: int):
+        super().assign(at, data)
+        if at < len(self.guard) and self.guard[at]:
+            self.on_code_write(at)
+
+
+class CompiledProgram(Program):
+    logger = log.getLogger('CompiledProgram')
+    # most recent translation at each index, shared between programs: (op code indexes, op code values, end, block)
+    translations: Dict[int, Tuple[Tuple[int, ...], Tuple[int, ...], int, Block]] = {}
+    # Instance mappings
+    __blocks: Dict[int, Tuple[Block, Tuple[int, ...]]]
+    __guard: bytearray
+
+    def __init__(self, program_instructions: List[int], inputs: InputSource = None, outputs: OutputSink = None):
+        super().__init__(program_instructions, inputs, outputs)
+        self.__blocks = {}
+        self.__guard = bytearray(len(program_instructions))
+        self.state = GuardedState(program_instructions, self.__guard, self.invalidate, self.state.index,
+                                  self.state.inputs, self.state.outputs)
+
+    def fork(self, inputs: InputSource = None, outputs: OutputSink = None):
+        # memory is the same on both sides at the fork, so the translations still hold. the fork keeps its own copy,
+        # invalidated by its own writes
+        program = super().fork(inputs, outputs)
+        program.__blocks = dict(self.__blocks)
+        program.__guard = bytearray(self.__guard)
+        program.state.guard, program.state.on_code_write = program.__guard, program.invalidate
+        return program
+
+    def run(self) -> int:
+        if self.tracer is not None or self.profiler is not None:
+            # traces and profiles are recorded per instruction, which only the interpreter can do
+            return super().run()
+        state = self.state
+        blocks = self.__blocks
+        guard = self.__guard
+        invalidate = self.invalidate
+        try:
+            while True:
+                block = blocks.get(state.index) or self.__translate(state.index)
+                if block is not None:
+                    index, executed = block[0](state.memory, guard, invalidate, state.mem_length)
+                    if executed > 0:
+                        # translated blocks write to memory directly rather than through the state
+                        state.writes += 1
+                        state.index = index
+                        self.instructions_executed += executed
+                        continue
+                # halts, input/output and anything else that can't be translated is left to the interpreter, as is an
+                # operation a block stopped on before running it
+                op = self.op_factory.resolve(state)
+                if not op.should_program_continue():
+                    self.status = Status.HALTED
+                    return state.memory[0]
+                op.compute(state)
+                self.instructions_executed += 1
+        except AwaitingInput:
+            self.status = Status.AWAITING_INPUT
+            return state.memory[0]
+
+    def precompile(self) -> int:
+        # translates every basic block reachable from the current index up front, instead of once execution gets there
+        graph = ControlFlowGraph(self.state.memory, self.op_factory, self.state.index)
+        return len([start for start in graph.blocks if self.__translate(start) is not None])
+
+    def invalidate(self, address: int) -> None:
+        stale = [start for start, block in self.__blocks.items() if address in block[1]]
+        for start in stale:
+            for op_code_index in self.__blocks.pop(start)[1]:
+                self.__guard[op_code_index] = 0
+        for block in self.__blocks.values():
+            for op_code_index in block[1]:
+                self.__guard[op_code_index] = 1
+        self.__guard[address] = 0
+
+    def __translate(self, start: int) -> Optional[Tuple[Block, Tuple[int, ...]]]:
+        memory = self.state.memory
+        known = CompiledProgram.translations.get(start)
+        if known is not None and known[2] <= len(self.__guard) \
+                and tuple(map(memory.__getitem__, known[0])) == known[1]:
+            op_code_indexes, block_fn = known[0], known[3]
+        else:
+            op_code_indexes, op_values, end = self.__scan(start)
+            if len(op_values) == 0:
+                return None
+            block_fn = translate_block(start, op_values)
+            CompiledProgram.translations[start] = (op_code_indexes, op_values, end, block_fn)
+            self.logger.debug('Translated block at %s with %s operations', start, len(op_values))
+        for op_code_index in op_code_indexes:
+            self.__guard[op_code_index] = 1
+        block = (block_fn, op_code_indexes)
+        self.__blocks[start] = block
+        return block
+
+    def __scan(self, start: int) -> Tuple[Tuple[int, ...], Tuple[int, ...], int]:
+        memory = self.state.memory
+        mem_length = len(self.__guard)
+        op_code_indexes = []
+        op_values = []
+        index = start
+        while 0 <= index < mem_length and len(op_values) < MAX_BLOCK_LENGTH:
+            decoded = self.op_factory.decode(memory[index])
+            if decoded is None or not is_translatable(*decoded) or decoded[0].next_op_start(index) > mem_length:
+                break
+            op_code_indexes.append(index)
+            op_values.append(memory[index])
+            index = decoded[0].next_op_start(index)
+        return tuple(op_code_indexes), tuple(op_values), index
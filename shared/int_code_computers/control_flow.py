@@ -0,0 +1,190 @@
+from typing import List, Tuple, Optional, Sequence, Dict, Set, NamedTuple
+
+from shared.int_code_computers.disassembler import Instruction, Disassembly, decode_at, successors, is_jump
+from shared.int_code_computers.operations import OperationFactory, HaltOperation, IMMEDIATE_MODE
+
+# how many times targets are re-resolved against the writes of newly reached code before giving up on them
+MAX_RESOLVE_PASSES = 8
+
+
+class BasicBlock:
+    start: int
+    instructions: List[Instruction]
+    # start of every block execution can continue at afterwards
+    successors: List[int]
+    # the block ends with a jump whose target is only known once running
+    indirect: bool
+
+    def __init__(self, start: int, instructions: List[Instruction], successors: List[int], indirect: bool):
+        self.start = start
+        self.instructions = instructions
+        self.successors = successors
+        self.indirect = indirect
+
+    @property
+    def end(self) -> int:
+        return self.instructions[-1].next_address
+
+    def __repr__(self):
+        return f'Block {self.start}-{self.end}: {len(self.instructions)} instructions, successors: {self.successors}' \
+               + (', ends in an indirect jump' if self.indirect else '')
+
+
+class Loop(NamedTuple):
+    # the back edge from the block at tail to the block at header
+    header: int
+    tail: int
+
+
+class ControlFlowGraph:
+    entry: int
+    instructions: Dict[int, Instruction]
+    blocks: Dict[int, BasicBlock]
+    # cells written by any reachable instruction, and those of them that are part of reachable code
+    written: Set[int]
+    self_modified: Set[int]
+    # (start, end) ranges of cells no execution path reaches, i.e. data and dead code
+    unreachable: List[Tuple[int, int]]
+    loops: List[Loop]
+    __resolved_targets: Dict[int, int]
+    __undecodable: Set[int]
+
+    def __init__(self, memory: Sequence[int], op_factory: OperationFactory, entry: int = 0):
+        self.entry = entry
+        self.__memory = memory
+        self.__op_factory = op_factory
+        self.__resolve()
+        self.__find_blocks()
+        self.__find_loops()
+        self.__find_unreachable()
+
+    def __reach(self, written_cells: Optional[Set[int]]) -> Dict[int, Instruction]:
+        # position mode jump targets are followed when the cell holding them isn't one of the written cells, so is
+        # constant. without written cells, none are followed
+        instructions: Dict[int, Instruction] = {}
+        self.__resolved_targets = {}
+        self.__undecodable = set()
+        pending = [self.entry]
+        while len(pending) > 0:
+            address = pending.pop()
+            if address in instructions:
+                continue
+            instruction = decode_at(self.__memory, address, self.__op_factory)
+            if instruction is None:
+                self.__undecodable.add(address)
+                continue
+            instructions[address] = instruction
+            target = None
+            if is_jump(instruction) and instruction.modes[1] != IMMEDIATE_MODE and written_cells is not None:
+                target_cell = instruction.operands[1]
+                if target_cell not in written_cells and 0 <= target_cell < len(self.__memory):
+                    target = self.__memory[target_cell]
+                    self.__resolved_targets[address] = target
+            pending.extend(successors(instruction, target))
+        return instructions
+
+    @staticmethod
+    def __writes(instructions: Dict[int, Instruction]) -> Set[int]:
+        return {instruction.operands[instruction.operation.writes_to - 1] for instruction in instructions.values()
+                if instruction.operation.writes_to is not None}
+
+    def __resolve(self) -> None:
+        # starts out resolving nothing, then resolves targets against the writes of the code reached so far
+        # until that stops changing. if it never settles, nothing is resolved
+        self.instructions = self.__reach(None)
+        self.written = self.__writes(self.instructions)
+        for _ in range(MAX_RESOLVE_PASSES):
+            instructions = self.__reach(self.written)
+            written = self.__writes(instructions)
+            if written == self.written:
+                self.instructions = instructions
+                break
+            self.written = written
+        else:
+            self.instructions = self.__reach(None)
+            self.written = self.__writes(self.instructions)
+        # execution also reaches cells that don't hold an instruction until the program has written one there
+        code_cells = {cell for instruction in self.instructions.values()
+                      for cell in range(instruction.address, instruction.next_address)} | self.__undecodable
+        self.self_modified = self.written & code_cells
+
+    def __find_blocks(self) -> None:
+        leaders = {self.entry}
+        for instruction in self.instructions.values():
+            if is_jump(instruction) or isinstance(instruction.operation, HaltOperation):
+                following = successors(instruction, self.__resolved_targets.get(instruction.address))
+                leaders.update(following)
+                leaders.add(instruction.next_address)
+        self.blocks = {}
+        for leader in sorted(leaders):
+            if leader not in self.instructions:
+                continue
+            block_instructions = [self.instructions[leader]]
+            while True:
+                last = block_instructions[-1]
+                if is_jump(last) or isinstance(last.operation, HaltOperation) \
+                        or last.next_address in leaders or last.next_address not in self.instructions:
+                    break
+                block_instructions.append(self.instructions[last.next_address])
+            last = block_instructions[-1]
+            following = [address for address in successors(last, self.__resolved_targets.get(last.address))
+                         if address in self.instructions]
+            indirect = is_jump(last) and last.modes[1] != IMMEDIATE_MODE \
+                and last.address not in self.__resolved_targets
+            self.blocks[leader] = BasicBlock(leader, block_instructions, following, indirect)
+
+    def __find_loops(self) -> None:
+        # back edges found with an iterative depth first search from the entry block
+        self.loops = []
+        if self.entry not in self.blocks:
+            return
+        on_stack, visited = {self.entry}, {self.entry}
+        stack = [(self.entry, iter(self.blocks[self.entry].successors))]
+        while len(stack) > 0:
+            start, following = stack[-1]
+            successor = next(following, None)
+            if successor is None:
+                stack.pop()
+                on_stack.discard(start)
+            elif successor in on_stack:
+                self.loops.append(Loop(successor, start))
+            elif successor not in visited and successor in self.blocks:
+                visited.add(successor)
+                on_stack.add(successor)
+                stack.append((successor, iter(self.blocks[successor].successors)))
+
+    def __find_unreachable(self) -> None:
+        code = bytearray(len(self.__memory))
+        for instruction in self.instructions.values():
+            code[instruction.address:instruction.next_address] = b'\x01' * instruction.length
+        self.unreachable = []
+        address = 0
+        while address < len(code):
+            if code[address]:
+                address += 1
+                continue
+            start = address
+            while address < len(code) and not code[address]:
+                address += 1
+            self.unreachable.append((start, address))
+
+    def loop_blocks(self, loop: Loop) -> Set[int]:
+        # every block of the natural loop: those that reach the tail without passing through the header
+        predecessors: Dict[int, Set[int]] = {}
+        for block in self.blocks.values():
+            for successor in block.successors:
+                predecessors.setdefault(successor, set()).add(block.start)
+        body = {loop.header, loop.tail}
+        pending = [loop.tail] if loop.tail != loop.header else []
+        while len(pending) > 0:
+            for predecessor in predecessors.get(pending.pop(), ()):
+                if predecessor not in body:
+                    body.add(predecessor)
+                    pending.append(predecessor)
+        return body
+
+
+def disassemble(memory: Sequence[int], op_factory: OperationFactory, entry: int = 0) -> Disassembly:
+    # follows the control flow from the entry point, so data in between code is never decoded as instructions
+    graph = ControlFlowGraph(memory, op_factory, entry)
+    return Disassembly(sorted(graph.instructions.values()), graph.unreachable)
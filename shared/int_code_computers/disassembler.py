@@ -0,0 +1,80 @@
+from typing import List, Tuple, Optional, NamedTuple, Sequence
+
+from shared.int_code_computers.operations import OperationFactory, Operation, JumpIfTrueOperation, \
+    JumpIfFalseOperation, HaltOperation, IMMEDIATE_MODE
+
+
+class Instruction(NamedTuple):
+    address: int
+    mnemonic: str
+    op_value: int
+    modes: Tuple[int, ...]
+    # the raw parameter cells, whether they are read as addresses or values depends on the modes
+    operands: Tuple[int, ...]
+    operation: Operation
+
+    @property
+    def length(self) -> int:
+        return self.operation.op_length
+
+    @property
+    def next_address(self) -> int:
+        return self.address + self.operation.op_length
+
+    def __str__(self):
+        parameters = [f'#{operand}' if mode == IMMEDIATE_MODE and number != self.operation.writes_to
+                      else f'@{operand}'
+                      for number, (mode, operand) in enumerate(zip(self.modes, self.operands), start=1)]
+        return f'{self.address:>6}: {self.mnemonic:<4} {", ".join(parameters)}'.rstrip()
+
+
+def decode_at(memory: Sequence[int], address: int, op_factory: OperationFactory) -> Optional[Instruction]:
+    # None when there is no valid instruction at the address, or it runs past the end of memory
+    if not 0 <= address < len(memory):
+        return None
+    decoded = op_factory.decode(memory[address])
+    if decoded is None or address + decoded[0].op_length > len(memory):
+        return None
+    op, modes = decoded
+    return Instruction(address, op.mnemonic, memory[address], modes,
+                       tuple(memory[address + 1: address + op.op_length]), op)
+
+
+def is_jump(instruction: Instruction) -> bool:
+    return isinstance(instruction.operation, (JumpIfTrueOperation, JumpIfFalseOperation))
+
+
+def successors(instruction: Instruction, resolved_target: Optional[int] = None) -> List[int]:
+    # addresses execution can continue at, as far as can be told without running. jumps to a position mode
+    # target can only be followed once its target has been resolved some other way
+    if isinstance(instruction.operation, HaltOperation):
+        return []
+    if not is_jump(instruction):
+        return [instruction.next_address]
+    following = []
+    condition_mode, target_mode = instruction.modes[0:2]
+    condition, target = instruction.operands[0:2]
+    jumps_on_true = isinstance(instruction.operation, JumpIfTrueOperation)
+    if condition_mode != IMMEDIATE_MODE or (condition != 0) == jumps_on_true:
+        if target_mode == IMMEDIATE_MODE:
+            following.append(target)
+        elif resolved_target is not None:
+            following.append(resolved_target)
+    if condition_mode != IMMEDIATE_MODE or (condition != 0) != jumps_on_true:
+        following.append(instruction.next_address)
+    return following
+
+
+class Disassembly:
+    instructions: List[Instruction]
+    # cells that aren't part of any reachable instruction: (start, end) ranges
+    data: List[Tuple[int, int]]
+
+    def __init__(self, instructions: List[Instruction], data: List[Tuple[int, int]]):
+        self.instructions = instructions
+        self.data = data
+
+    def lines(self, memory: Sequence[int]) -> List[str]:
+        entries = [(instruction.address, str(instruction)) for instruction in self.instructions] + \
+                  [(start, f'{start:>6}: DATA {list(memory[start:end])}') for start, end in self.data]
+        return [line for _, line in sorted(entries)]
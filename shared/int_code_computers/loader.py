@@ -0,0 +1,143 @@
+import hashlib
+import logging as log
+import mmap
+import os
+import struct
+from array import array
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+from shared.int_code_computers.state import ArrayMemory
+
+# files at least this big are memory mapped, instead of read through a buffer
+MMAP_THRESHOLD = 1 << 20
+CHUNK_SIZE = 1 << 16
+Cells = Union[array, List[int]]
+
+
+def parse(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> ArrayMemory:
+    # reads comma separated ints a chunk at a time, the number a chunk ends part way through is carried over
+    cells: Cells = array('q')
+    carried = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        pieces = (carried + chunk).split(b',')
+        carried = pieces.pop()
+        cells = __extend(cells, list(map(int, pieces)))
+    if carried.strip():
+        cells = __extend(cells, [int(carried)])
+    memory = ArrayMemory()
+    memory.cells = cells
+    return memory
+
+
+def __extend(cells: Cells, values: List[int]) -> Cells:
+    if isinstance(cells, list):
+        cells.extend(values)
+        return cells
+    try:
+        cells.extend(array('q', values))
+        return cells
+    except OverflowError:
+        # falls back to python ints for values that don't fit in 64 bits, like ArrayMemory does
+        return list(cells) + values
+
+
+class ImageLoader:
+    logger = log.getLogger('ImageLoader')
+    __MAGIC = b'ICI2'
+    # magic, then the size & modification time of the file the cells were parsed from, then how many cells follow
+    __HEADER = struct.Struct('<4sQqQ')
+    # when set, parsed images are also kept here, by the hash of the file they came from, so processes that keep
+    # starting on the same image skip parsing it. None (the default) keeps them in memory only
+    directory: Optional[str]
+    # how many times an image actually had to be parsed
+    parsed: int
+    # path -> (modification time, size, parsed cells). only the latest version of each file is kept
+    __images: Dict[str, Tuple[int, int, Cells]]
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.parsed = 0
+        self.__images = {}
+
+    def load(self, source: Union[str, os.PathLike, BinaryIO]) -> ArrayMemory:
+        # every call returns its own copy, so the image can be run (and changed) without affecting later loads
+        if not isinstance(source, (str, os.PathLike)):
+            self.parsed += 1
+            return parse(source)
+        stat = os.stat(source)
+        path = os.path.abspath(source)
+        held = self.__images.get(path)
+        if held is not None and held[:2] == (stat.st_mtime_ns, stat.st_size):
+            cells = held[2]
+        else:
+            cells = self.__load_file(source, stat)
+            self.__images[path] = (stat.st_mtime_ns, stat.st_size, cells)
+        memory = ArrayMemory()
+        memory.cells = cells[:]
+        return memory
+
+    @property
+    def images_held(self) -> int:
+        return len(self.__images)
+
+    def __load_file(self, path: Union[str, os.PathLike], stat: os.stat_result) -> Cells:
+        with open(path, 'rb') as source:
+            if stat.st_size == 0:
+                return array('q')
+            if stat.st_size < MMAP_THRESHOLD:
+                return self.__cached(source.read(), stat, lambda contents: parse(BytesIO(contents)))
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self.__cached(mapped, stat, parse)
+
+    def __cached(self, contents, stat: os.stat_result, parse_contents) -> Cells:
+        if self.directory is None:
+            self.parsed += 1
+            return parse_contents(contents).cells
+        cached_path = os.path.join(self.directory, hashlib.sha1(contents).hexdigest())
+        cells = self.__read_cached(cached_path, stat)
+        if cells is not None:
+            return cells
+        self.parsed += 1
+        cells = parse_contents(contents).cells
+        if isinstance(cells, array):
+            self.__store(cached_path, stat, cells)
+        return cells
+
+    def __read_cached(self, cached_path: str, stat: os.stat_result) -> Optional[array]:
+        # anything that isn't a complete file cached from this exact source is parsed again instead of trusted
+        try:
+            with open(cached_path, 'rb') as cached:
+                header = cached.read(ImageLoader.__HEADER.size)
+                body = cached.read()
+        except FileNotFoundError:
+            return None
+        cells = array('q')
+        if len(header) < ImageLoader.__HEADER.size \
+                or ImageLoader.__HEADER.unpack(header) != (ImageLoader.__MAGIC, stat.st_size, stat.st_mtime_ns,
+                                                           len(body) // cells.itemsize) \
+                or len(body) % cells.itemsize != 0:
+            self.logger.debug('Ignoring cached cells in %s, they are not from this file or are incomplete',
+                              cached_path)
+            return None
+        cells.frombytes(body)
+        return cells
+
+    def __store(self, cached_path: str, stat: os.stat_result, cells: array) -> None:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        temporary = f'{cached_path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as target:
+            target.write(ImageLoader.__HEADER.pack(ImageLoader.__MAGIC, stat.st_size, stat.st_mtime_ns, len(cells)))
+            cells.tofile(target)
+        os.replace(temporary, cached_path)
+        self.logger.debug('Cached %s parsed cells in %s', len(cells), cached_path)
+
+
+__LOADER = ImageLoader()
+
+
+def load(source: Union[str, os.PathLike, BinaryIO]) -> ArrayMemory:
+    return __LOADER.load(source)
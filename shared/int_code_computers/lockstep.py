@@ -0,0 +1,148 @@
+import logging as log
+from typing import List, Tuple, Iterable, Iterator, Optional, Sequence, Dict
+
+from shared.int_code_computers.operations import Operation, AddOperation, MultiplyOperation, LessThanOperation, \
+    EqualsOperation, JumpIfTrueOperation, JumpIfFalseOperation, HaltOperation, POSITION_MODE, IMMEDIATE_MODE
+from shared.int_code_computers.channels import Channel
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.search import ParameterSweep, Parameters
+
+try:
+    import numpy as np
+except ImportError:
+    # without numpy every machine runs on the scalar Program
+    np = None
+
+# products at least this big might not fit in int64, those machines are left to the scalar Program instead
+PRODUCT_LIMIT = 2.0 ** 62
+
+
+class LockstepSweep:
+    # runs a machine per candidate, with the candidate's values in the given addresses. memories are the rows of a
+    # 2-D int64 array, and each step applies one instruction to every machine at the same index with the same op
+    # code in one go. machines that overflow, do input/output or fail any other way are rerun on the scalar Program
+    logger = log.getLogger('LockstepSweep')
+    __SUPPORTED = (AddOperation, MultiplyOperation, LessThanOperation, EqualsOperation, JumpIfTrueOperation,
+                   JumpIfFalseOperation, HaltOperation)
+    image: List[int]
+    addresses: Tuple[int, ...]
+    # how many machines ran to the halt in lockstep, and how many ran on the scalar Program instead
+    vectorized: int
+    scalar: int
+    __sweep: ParameterSweep
+
+    def __init__(self, image: List[int], addresses: Sequence[int] = (1, 2)):
+        self.image = list(image)
+        self.addresses = tuple(addresses)
+        self.vectorized = 0
+        self.scalar = 0
+        # nothing is there to give machines that read an input, so they pause instead of waiting on the console
+        self.__sweep = ParameterSweep(self.image, self.addresses, Channel())
+
+    def run(self, candidates: Sequence[Parameters]) -> List[Optional[int]]:
+        # memory[0] of every machine once it halted, in the order of the candidates. None for machines that paused
+        # awaiting an input
+        candidates = list(candidates)
+        results: Dict[int, int] = {}
+        if np is None:
+            fallen_back = list(range(len(candidates)))
+        else:
+            fallen_back = self.__run_lockstep(candidates, results)
+        self.vectorized += len(results)
+        self.scalar += len(fallen_back)
+        for machine in fallen_back:
+            result = self.__sweep.run(candidates[machine])
+            results[machine] = result if self.__sweep.status == Status.HALTED else None
+        return [results[machine] for machine in range(len(candidates))]
+
+    def results(self, candidates: Iterable[Parameters]) -> Iterator[Tuple[Parameters, Optional[int]]]:
+        candidates = list(candidates)
+        return zip(candidates, self.run(candidates))
+
+    def find(self, target: int, candidates: Iterable[Parameters]) -> Optional[Parameters]:
+        return next((parameters for parameters, result in self.results(candidates) if result == target), None)
+
+    def __run_lockstep(self, candidates: List[Parameters], results: Dict[int, int]) -> List[int]:
+        length = len(self.image)
+        if any(not 0 <= address < length for address in self.addresses):
+            return list(range(len(candidates)))
+        try:
+            image = np.array(self.image, dtype=np.int64)
+            parameters = np.array(candidates, dtype=np.int64).reshape(len(candidates), len(self.addresses))
+        except OverflowError:
+            return list(range(len(candidates)))
+        memory = np.tile(image, (len(candidates), 1))
+        memory[:, list(self.addresses)] = parameters
+        index = np.zeros(len(candidates), dtype=np.int64)
+        running = np.arange(len(candidates))
+        fallen_back = []
+        steps = 0
+        while running.size > 0:
+            continuing = []
+            indexes = index[running]
+            # machines that diverged are regrouped by index, and then by the op code at it (code can be modified)
+            for address in np.unique(indexes).tolist():
+                at_address = running[indexes == address]
+                if not 0 <= address < length:
+                    fallen_back += at_address.tolist()
+                    continue
+                op_values = memory[at_address, address]
+                for op_value in np.unique(op_values).tolist():
+                    group = at_address[op_values == op_value]
+                    valid = self.__step(memory, index, group, address, op_value, results)
+                    if valid is None:
+                        continue
+                    continuing.append(group[valid])
+                    fallen_back += group[~valid].tolist()
+            running = np.concatenate(continuing) if len(continuing) > 0 else np.zeros(0, dtype=np.int64)
+            steps += 1
+        self.logger.debug('%s machines halted after %s lockstep steps, %s fell back to the scalar Program',
+                          len(results), steps, len(fallen_back))
+        return fallen_back
+
+    def __step(self, memory, index, group, address: int, op_value: int, results: Dict[int, int]):
+        # returns which machines of the group carry on in lockstep, the others fall back. None once they halted
+        length = memory.shape[1]
+        decoded = Program.op_factory.decode(op_value)
+        if decoded is None or not isinstance(decoded[0], LockstepSweep.__SUPPORTED) \
+                or any(mode not in (POSITION_MODE, IMMEDIATE_MODE) for mode in decoded[1]) \
+                or address + decoded[0].op_length > length:
+            return np.zeros(group.size, dtype=bool)
+        op, modes = decoded
+        if isinstance(op, HaltOperation):
+            results.update(zip(group.tolist(), memory[group, 0].tolist()))
+            return None
+        valid = np.ones(group.size, dtype=bool)
+        first, second = (LockstepSweep.__operand(memory, group, address, number, modes[number - 1], valid)
+                         for number in (1, 2))
+        if isinstance(op, (JumpIfTrueOperation, JumpIfFalseOperation)):
+            taken = first != 0 if isinstance(op, JumpIfTrueOperation) else first == 0
+            index[group[valid]] = np.where(taken, second, op.next_op_start(address))[valid]
+            return valid
+        result, overflowed = LockstepSweep.__compute(op, first, second)
+        destination = memory[group, address + 3]
+        valid &= ~overflowed & (destination >= 0) & (destination < length)
+        memory[group[valid], destination[valid]] = result[valid]
+        index[group[valid]] = op.next_op_start(address)
+        return valid
+
+    @staticmethod
+    def __operand(memory, group, address: int, number: int, mode: int, valid):
+        cells = memory[group, address + number]
+        if mode == IMMEDIATE_MODE:
+            return cells
+        in_memory = (cells >= 0) & (cells < memory.shape[1])
+        valid &= in_memory
+        return memory[group, np.where(in_memory, cells, 0)]
+
+    @staticmethod
+    def __compute(op: Operation, first, second):
+        # returns the results, and which of them overflowed int64
+        if isinstance(op, AddOperation):
+            result = first + second
+            return result, ((first >= 0) == (second >= 0)) & ((result >= 0) != (first >= 0))
+        if isinstance(op, MultiplyOperation):
+            too_big = np.abs(first.astype(np.float64) * second.astype(np.float64)) >= PRODUCT_LIMIT
+            return np.where(too_big, 0, first) * second, too_big
+        compared = first < second if isinstance(op, LessThanOperation) else first == second
+        return compared.astype(np.int64), np.zeros(first.size, dtype=bool)
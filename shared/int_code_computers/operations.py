@@ -1,6 +1,7 @@
 import logging as log
 from abc import abstractmethod
-from typing import List, Optional, Mapping
+from itertools import product
+from typing import List, Optional, Mapping, Dict, Tuple
 
 from shared.int_code_computers.state import State
 
@@ -10,34 +11,34 @@ POSITION_MODE = 0
 __LOGGER = log.getLogger('Operations-Inputs')
 
 
+def get_input(state: State, input_number: int) -> Optional[int]:
+    memory = state.memory
+    param_index = state.index + input_number
+    if not 0 <= param_index < state.mem_length:
+        return None
+    mode = memory[state.index] // 10 ** (input_number + 1) % 10
+    if mode == POSITION_MODE:
+        address = memory[param_index]
+        return memory[address] if 0 <= address < state.mem_length else None
+    elif mode == IMMEDIATE_MODE:
+        return memory[param_index]
+    return None
+
+
 def get_inputs(state: State, num_inputs: int) -> List[Optional[int]]:
-    full_codes: List[int] = [int(code) for code in f'{state.current_op():0{num_inputs + 1}}']
-    instruction_types = full_codes[0:len(full_codes) - 2:1]
-    inputs = []
-    input_number = 1
-    index = state.index
-    __LOGGER.debug('Getting inputs for op at %s, with code: %s', state.current_op(), full_codes)
-    for int_type_code in reversed(instruction_types):
-        if int_type_code == POSITION_MODE and state.is_in_memory(index + input_number):
-            inputs.append(state.at(state.at(index + input_number))
-                          if state.is_in_memory(state.at(index + input_number))
-                          else None)
-        elif int_type_code == IMMEDIATE_MODE and state.is_in_memory(index + input_number):
-            inputs.append(state.at(index + input_number)
-                          if state.is_in_memory(index + input_number)
-                          else None)
-        else:
-            inputs.append(None)
-        input_number = input_number + 1
-    return inputs
+    __LOGGER.debug('Getting inputs for op at %s, with code: %s', state.index, state.current_op())
+    return [get_input(state, input_number) for input_number in range(1, num_inputs)]
 
 
-# root class for operations
+# root class for operations. compute runs once per executed instruction, so it doesn't log: see tracing instead
 class Operation:
     # Constants
     logger = log.getLogger('Operations')
     op_code = -1
     op_length = -1
+    mnemonic = '?'
+    # the parameter holding the address the operation writes to, if it writes at all
+    writes_to: Optional[int] = None
 
     def __init__(self):
         self.validate()
@@ -66,46 +67,47 @@ class Operation:
 class AddOperation(Operation):
     op_code = 1
     op_length = 4
+    mnemonic = 'ADD'
+    writes_to = 3
 
     def compute(self, state: State):
-        val1, val2 = get_inputs(state, self.op_length)[0:2]
-        result_index = state.at(state.index + 3)
-        self.logger.debug('Adding value: %s to %s into position %s', val1, val2, result_index)
-        state.assign(result_index, val1 + val2)
+        val1, val2 = get_input(state, 1), get_input(state, 2)
+        state.assign(state.at(state.index + 3), val1 + val2)
         state.increase_index(self.op_length)
 
 
 class MultiplyOperation(Operation):
     op_code = 2
     op_length = 4
+    mnemonic = 'MUL'
+    writes_to = 3
 
     def compute(self, state: State):
-        val1, val2 = get_inputs(state, self.op_length)[0:2]
-        result_index = state.at(state.index + 3)
-        self.logger.debug('Multiplying value: %s with %s into position %s', val1, val2, result_index)
-        state.assign(result_index, val1 * val2)
+        val1, val2 = get_input(state, 1), get_input(state, 2)
+        state.assign(state.at(state.index + 3), val1 * val2)
         state.increase_index(self.op_length)
 
 
 class InputOperation(Operation):
     op_code = 3
     op_length = 2
+    mnemonic = 'IN'
+    writes_to = 1
 
     def compute(self, state: State):
         result_index = state.at(state.index + 1)
-        self.logger.debug("Requesting input from user to be stored at position %s in memory", result_index)
-        state.assign(result_index, int(input("Input: ")))
+        # an empty input source raises AwaitingInput here, before anything has changed
+        state.assign(result_index, state.inputs.read())
         state.increase_index(self.op_length)
 
 
 class OutputOperation(Operation):
-    __logger = log.getLogger('OutputOperation')
     op_code = 4
     op_length = 2
+    mnemonic = 'OUT'
 
     def compute(self, state: State):
-        result_index: int = get_inputs(state, self.op_length)[0]
-        self.__logger.info("Output operation, op_ind: %s, val: %s", state.index, result_index)
+        state.outputs.write(get_input(state, 1))
         state.increase_index(self.op_length)
 
 
@@ -113,72 +115,61 @@ class JumpSupport:
     op_length = 3
 
     @staticmethod
-    def potentially_execute_jump(logger, state: State, should_jump: bool, jump_to: int):
+    def potentially_execute_jump(state: State, should_jump: bool, jump_to: int):
         if should_jump:
-            logger.info('jumping from %s to %s', state.index, jump_to)
             state.index = jump_to
         else:
-            logger.debug("not jumping at this point, should_jump=%s", should_jump)
             state.increase_index(JumpSupport.op_length)
 
 
 class JumpIfTrueOperation(Operation):
-    __logger = log.getLogger('JumpIfTrueOperation')
     op_code = 5
     op_length = 3
+    mnemonic = 'JT'
 
     def compute(self, state: State):
-        should_jump, to_location = get_inputs(state, self.op_length)[0:2]
-        JumpSupport.potentially_execute_jump(self.__logger, state, should_jump != 0, to_location)
+        should_jump, to_location = get_input(state, 1), get_input(state, 2)
+        JumpSupport.potentially_execute_jump(state, should_jump != 0, to_location)
 
 
 class JumpIfFalseOperation(Operation):
-    __logger = log.getLogger('JumpIfFalseOperation')
     op_code = 6
     op_length = 3
+    mnemonic = 'JF'
 
     def compute(self, state: State):
-        should_jump, to_location = get_inputs(state, self.op_length)[0:2]
-        JumpSupport.potentially_execute_jump(self.__logger, state, should_jump == 0, to_location)
+        should_jump, to_location = get_input(state, 1), get_input(state, 2)
+        JumpSupport.potentially_execute_jump(state, should_jump == 0, to_location)
 
 
 class LessThanOperation(Operation):
-    __logger = log.getLogger('LessThanOperation')
     op_code = 7
     op_length = 4
+    mnemonic = 'LT'
+    writes_to = 3
 
     def compute(self, state: State):
-        val_1, val_2 = get_inputs(state, self.op_length)[0:2]
-        assignment_index = state.at(state.index + 3)
-        if val_1 < val_2:
-            self.__logger.info("Values were less than, assigning true to %s", assignment_index)
-            state.assign(assignment_index, 1)
-        else:
-            self.__logger.info("Values were not less than, assigning false to %s", assignment_index)
-            state.assign(assignment_index, 0)
+        val_1, val_2 = get_input(state, 1), get_input(state, 2)
+        state.assign(state.at(state.index + 3), 1 if val_1 < val_2 else 0)
         state.increase_index(self.op_length)
 
 
 class EqualsOperation(Operation):
-    __logger = log.getLogger('EqualsOperation')
     op_code = 8
     op_length = 4
+    mnemonic = 'EQ'
+    writes_to = 3
 
     def compute(self, state: State):
-        val_1, val_2 = get_inputs(state, self.op_length)[0:2]
-        assignment_index = state.at(state.index + 3)
-        if val_1 == val_2:
-            self.__logger.info("Values were equal, assigning true to %s", assignment_index)
-            state.assign(assignment_index, 1)
-        else:
-            self.__logger.info("Values were not equal than, assigning true to %s", assignment_index)
-            state.assign(assignment_index, 0)
+        val_1, val_2 = get_input(state, 1), get_input(state, 2)
+        state.assign(state.at(state.index + 3), 1 if val_1 == val_2 else 0)
         state.increase_index(self.op_length)
 
 
 class HaltOperation(Operation):
     op_code = 99
     op_length = 1
+    mnemonic = 'HALT'
 
     def compute(self, state: State):
         Operation.logger.info("End of program reached, final index was: %s", state.index)
@@ -191,20 +182,41 @@ class OperationFactory:
     logger = log.getLogger('OperationFactory')
 
     mappings: Mapping[str, Operation]
+    # every op_code + parameter modes value -> (operation, modes of each parameter)
+    decode_table: Dict[int, Tuple[Operation, Tuple[int, ...]]]
 
     def __init__(self):
         self.mappings = {str(op.get_op_code()): op() for op in Operation.__subclasses__()}
         if len(self.mappings) != len(Operation.__subclasses__()):
             raise RuntimeError("Operation Factory found a non-unique op_code in extending classes of Operation")
+        self.decode_table = self.__build_decode_table()
+
+    def __build_decode_table(self) -> Dict[int, Tuple[Operation, Tuple[int, ...]]]:
+        table = {}
+        for op in self.mappings.values():
+            for modes in product((POSITION_MODE, IMMEDIATE_MODE), repeat=op.op_length - 1):
+                op_value = op.get_op_code() + sum(mode * 10 ** (param + 2) for param, mode in enumerate(modes))
+                table[op_value] = (op, modes)
+        return table
+
+    def decode(self, op_value: int) -> Optional[Tuple[Operation, Tuple[int, ...]]]:
+        decoded = self.decode_table.get(op_value)
+        if decoded is None:
+            # values outside of the table (i.e. unsupported modes) are matched on their suffix, as they always were
+            potential_op_list = [op for op_code, op in self.mappings.items() if str(op_value).endswith(op_code)]
+            if len(potential_op_list) == 0:
+                return None
+            op = potential_op_list[0]
+            decoded = (op, tuple(op_value // 10 ** (param + 2) % 10 for param in range(op.op_length - 1)))
+            self.decode_table[op_value] = decoded
+        return decoded
 
     def resolve(self, state: State, resolve_at_index=-1) -> Operation:
         index = state.index if resolve_at_index == -1 else resolve_at_index
-        potential_op_list = [entry for entry in self.mappings.items()
-                             if str(state.at(index) if state.is_in_memory(index) else 98)  # 98 is not a valid op code
-                             .endswith(entry[0])]
-        if len(potential_op_list) is 0:
+        decoded = self.decode(state.at(index) if state.is_in_memory(index) else 98)  # 98 is not a valid op code
+        if decoded is None:
             self.logger.error('Something went wrong: op_code was not valid. Current position: %s, op_code was: %s',
                               index, state.at(index) if state.is_in_memory(index) else None)
             raise RuntimeError("Could not find operation with op_code " +
                                f"{state.at(index) if state.is_in_memory(index) else None}")
-        return potential_op_list[0][1]
+        return decoded[0]
@@ -0,0 +1,53 @@
+from typing import List, Tuple, Iterator, NamedTuple, Sequence, Iterable
+
+from shared.int_code_computers.channels import Channel, CollectingOutput
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.state import Snapshot, freeze
+
+
+class Branch(NamedTuple):
+    inputs: Tuple[int, ...]
+    # everything written along the way, from the start of the program
+    outputs: Tuple[int, ...]
+    program: Program
+
+    @property
+    def status(self) -> Status:
+        return self.program.status
+
+
+class InputTree:
+    # runs the program once up to each point where it reads an input, and forks from there for every value that
+    # input can take. runs that share their first inputs never execute the part they share more than once
+    image: List[int]
+    # the values to try at each input, in the order the program reads them
+    stages: List[List[int]]
+    # what was actually executed, over every fork
+    instructions_executed: int
+
+    def __init__(self, image: Sequence[int], stages: Sequence[Iterable[int]]):
+        self.image = list(image)
+        self.stages = [list(stage) for stage in stages]
+        self.instructions_executed = 0
+
+    def branches(self) -> Iterator[Branch]:
+        # a branch ends once the program halts, or it has been given a value for every stage
+        root = Program.from_state(Snapshot(freeze(self.image), {}, 0).fork())
+        root.state.inputs, root.state.outputs = Channel(), CollectingOutput()
+        self.__run(root)
+        pending = [((), (), root)]
+        while len(pending) > 0:
+            inputs, outputs, program = pending.pop()
+            if program.status == Status.HALTED or len(inputs) == len(self.stages):
+                yield Branch(inputs, outputs, program)
+                continue
+            # forks from the point the program paused on, in reverse so branches come out in the order of the stages
+            for value in reversed(self.stages[len(inputs)]):
+                fork = program.fork(Channel([value]), CollectingOutput())
+                self.__run(fork)
+                pending.append((inputs + (value,), outputs + tuple(fork.state.outputs.values), fork))
+
+    def __run(self, program: Program) -> None:
+        executed = program.instructions_executed
+        program.run()
+        self.instructions_executed += program.instructions_executed - executed
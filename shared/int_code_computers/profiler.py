@@ -0,0 +1,91 @@
+import json
+from collections import Counter
+from typing import Dict, List, Any
+
+from shared.int_code_computers.operations import Operation, get_input
+from shared.int_code_computers.state import State
+
+PHASES = ('decode', 'fetch', 'execute')
+
+
+class Profiler:
+    # every instruction is counted, but only one in every `sample_every` is timed, which keeps the overhead low
+    # enough to leave switched on
+    sample_every: int
+    instructions: int
+    address_counts: Counter
+    op_counts: Counter
+    # (jumped to, jumped from) -> times taken, for every jump backwards
+    loop_counts: Counter
+    sampled: int
+    phase_seconds: Dict[str, float]
+    __mnemonics: Dict[int, str]
+
+    def __init__(self, sample_every: int = 64):
+        self.sample_every = sample_every
+        self.instructions = 0
+        self.address_counts = Counter()
+        self.op_counts = Counter()
+        self.loop_counts = Counter()
+        self.sampled = 0
+        self.phase_seconds = {phase: 0.0 for phase in PHASES}
+        self.__mnemonics = {}
+
+    def should_time(self) -> bool:
+        return self.instructions % self.sample_every == 0
+
+    @staticmethod
+    def fetch(state: State, op: Operation) -> None:
+        # the same reads compute does, so they can be timed on their own
+        for input_number in range(1, op.op_length):
+            if input_number != op.writes_to:
+                get_input(state, input_number)
+
+    def count(self, index: int, op: Operation, next_index: int) -> None:
+        self.instructions += 1
+        self.address_counts[index] += 1
+        self.op_counts[op.mnemonic] += 1
+        self.__mnemonics[index] = op.mnemonic
+        if next_index is not None and next_index <= index:
+            self.loop_counts[(next_index, index)] += 1
+
+    def add_timings(self, decode: float, fetch: float, compute: float) -> None:
+        self.sampled += 1
+        self.phase_seconds['decode'] += decode
+        self.phase_seconds['fetch'] += fetch
+        # compute fetches its operands again, so that share is taken back out of it
+        self.phase_seconds['execute'] += max(compute - fetch, 0.0)
+
+    def estimated_phase_seconds(self) -> Dict[str, float]:
+        scale = self.instructions / self.sampled if self.sampled > 0 else 0
+        return {phase: seconds * scale for phase, seconds in self.phase_seconds.items()}
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        return {
+            'instructions': self.instructions,
+            'timed_instructions': self.sampled,
+            'estimated_phase_seconds': self.estimated_phase_seconds(),
+            'operations': dict(self.op_counts.most_common()),
+            'hot_addresses': [{'address': address, 'operation': self.__mnemonics[address], 'count': count}
+                              for address, count in self.address_counts.most_common(top)],
+            'hot_loops': [{'header': header, 'tail': tail, 'iterations': count}
+                          for (header, tail), count in self.loop_counts.most_common(top)],
+        }
+
+    def to_json(self, top: int = 10) -> str:
+        return json.dumps(self.report(top), indent=2)
+
+    def to_text(self, top: int = 10) -> str:
+        report = self.report(top)
+        lines: List[str] = [f"Instructions executed: {report['instructions']} "
+                            f"({report['timed_instructions']} of them timed)"]
+        lines += [f'  {phase:<8} ~{seconds:.6f}s' for phase, seconds in report['estimated_phase_seconds'].items()]
+        lines.append('Operations:')
+        lines += [f'  {mnemonic:<5} {count}' for mnemonic, count in report['operations'].items()]
+        lines.append('Hot addresses:')
+        lines += [f"  {entry['address']:>6}: {entry['operation']:<5} {entry['count']}"
+                  for entry in report['hot_addresses']]
+        lines.append('Hot loops:')
+        lines += [f"  {entry['header']:>6} <- {entry['tail']:<6} {entry['iterations']} iterations"
+                  for entry in report['hot_loops']]
+        return '\n'.join(lines)
@@ -1,8 +1,22 @@
 import logging as log
-from typing import List
+from enum import Enum
+from time import perf_counter
+from typing import List, Optional, Tuple
 
-from shared.int_code_computers.operations import Operation, OperationFactory
+from shared.int_code_computers.cache import ResultCache, HashedState, RecordingOutput, CachedRun
+from shared.int_code_computers.channels import InputSource, OutputSink, AwaitingInput
+from shared.int_code_computers.control_flow import disassemble
+from shared.int_code_computers.disassembler import Disassembly
+from shared.int_code_computers.operations import OperationFactory
+from shared.int_code_computers.profiler import Profiler
 from shared.int_code_computers.state import State
+from shared.int_code_computers.tracing import Tracer
+
+
+class Status(Enum):
+    READY = 'ready'
+    AWAITING_INPUT = 'awaiting input'
+    HALTED = 'halted'
 
 
 class Program:
@@ -10,44 +24,158 @@ class Program:
     op_factory = OperationFactory()
     # Instance mappings
     state: State
+    status: Status = Status.READY
+    instructions_executed: int = 0
+    tracer: Optional[Tracer] = None
+    profiler: Optional[Profiler] = None
+    cache: Optional[ResultCache] = None
+    # the state & its write count the disassembly was made at
+    __disassembly: Optional[Tuple[State, int, Disassembly]] = None
+
+    def __init__(self, program_instructions: List[int], inputs: InputSource = None, outputs: OutputSink = None,
+                 tracer: Tracer = None, profiler: Profiler = None, cache: ResultCache = None):
+        # cached programs keep a hash of their memory, writes have to go through the state to keep it up to date
+        state_type = State if cache is None else HashedState
+        self.state = state_type(program_instructions, inputs=inputs, outputs=outputs)
+        self.tracer = tracer
+        self.profiler = profiler
+        self.cache = cache
 
-    def __init__(self, program_instructions: List[int]):
-        self.state = State(program_instructions)
-        self.__populate_operations()
+    @classmethod
+    def from_state(cls, state: State):
+        program = cls.__new__(cls)
+        program.state = state
+        return program
+
+    def fork(self, inputs: InputSource = None, outputs: OutputSink = None):
+        # carries on from wherever this program is, e.g. paused on an input. cheap when memory is copy on write. the
+        # fork is the same kind of program, reading & writing this program's channels unless it's given its own
+        state = self.state.fork()
+        if inputs is not None:
+            state.inputs = inputs
+        if outputs is not None:
+            state.outputs = outputs
+        program = type(self).from_state(state)
+        program.status = self.status
+        program.instructions_executed = self.instructions_executed
+        program.tracer, program.profiler, program.cache = self.tracer, self.profiler, self.cache
+        return program
 
     def run(self) -> int:
-        op = self.__resolve_op()
-        while op.should_program_continue():
-            op.compute(self.state)
-            op = self.__resolve_op()
+        # runs until the program halts, or pauses on an input that isn't available yet. run again to resume
+        if self.cache is not None:
+            return self.__run_cached(self.cache)
+        return self.__run()
+
+    def __run_cached(self, cache: ResultCache) -> int:
+        # a hit replays what the run did without executing it. only runs that reached the halt are kept
+        state = self.state
+        key = cache.key(state)
+        if key is None:
+            return self.__run()
+        cached = cache.get(key)
+        if cached is not None:
+            cached.replay(state)
+            self.instructions_executed += cached.instructions
+            self.status = Status.HALTED
+            return state.memory[0]
+        outputs, pending, executed = state.outputs, len(state.inputs), self.instructions_executed
+        recording = state.outputs = RecordingOutput(outputs)
+        try:
+            result = self.__run()
+        finally:
+            state.outputs = outputs
+        if self.status == Status.HALTED:
+            cache.put(key, CachedRun(tuple((address, state.memory[address]) for address in state.written),
+                                     tuple(recording.values), pending - len(state.inputs), state.index,
+                                     self.instructions_executed - executed))
+        return result
 
+    def __run(self) -> int:
+        try:
+            if self.profiler is not None:
+                self.__execute_profiled(self.profiler)
+            elif self.tracer is None:
+                self.__execute()
+            else:
+                self.__execute_traced(self.tracer)
+            self.status = Status.HALTED
+        except AwaitingInput:
+            self.status = Status.AWAITING_INPUT
         return self.state.memory[0]
 
-    def __resolve_op(self):
-        return self.op_factory.resolve(self.state)
+    def __execute(self) -> None:
+        state, resolve = self.state, self.op_factory.resolve
+        executed = 0
+        try:
+            op = resolve(state)
+            while op.should_program_continue():
+                op.compute(state)
+                executed += 1
+                op = resolve(state)
+        finally:
+            self.instructions_executed += executed
+
+    def __execute_traced(self, tracer: Tracer) -> None:
+        # kept apart from __execute, so that running without a tracer pays nothing for tracing
+        state, resolve = self.state, self.op_factory.resolve
+        executed = 0
+        try:
+            op = resolve(state)
+            while op.should_program_continue():
+                tracer.before(state, op)
+                op.compute(state)
+                tracer.after(state)
+                executed += 1
+                op = resolve(state)
+        finally:
+            self.instructions_executed += executed
+
+    def __execute_profiled(self, profiler: Profiler) -> None:
+        # like tracing, kept apart from __execute. still traces when there is a tracer as well
+        state, resolve, tracer = self.state, self.op_factory.resolve, self.tracer
+        executed = 0
+        try:
+            while True:
+                index = state.index
+                if profiler.should_time():
+                    started = perf_counter()
+                    op = resolve(state)
+                    decoded = perf_counter()
+                    if not op.should_program_continue():
+                        break
+                    profiler.fetch(state, op)
+                    fetched = perf_counter()
+                    if tracer is not None:
+                        tracer.before(state, op)
+                    op.compute(state)
+                    profiler.add_timings(decoded - started, fetched - decoded, perf_counter() - fetched)
+                else:
+                    op = resolve(state)
+                    if not op.should_program_continue():
+                        break
+                    if tracer is not None:
+                        tracer.before(state, op)
+                    op.compute(state)
+                if tracer is not None:
+                    tracer.after(state)
+                profiler.count(index, op, state.index)
+                executed += 1
+        finally:
+            self.instructions_executed += executed
+
+    def disassemble(self) -> Disassembly:
+        # only done on request, and redone only once memory has been written since the last time. writes made straight
+        # to state.memory, rather than through the state, aren't seen
+        if self.__disassembly is None or self.__disassembly[0] is not self.state \
+                or self.__disassembly[1] != self.state.writes:
+            self.__disassembly = (self.state, self.state.writes, disassemble(self.state.memory, self.op_factory))
+        return self.__disassembly[2]
 
     def print_instructions(self) -> None:
-        self.__populate_operations()
         Program.logger.info('--- Program ---')
-        Program.logger.info('%s', str(self.__operations)
-                            .replace("], ", "]\n", -1).replace("[[", "[\n[", 1).replace("]]", "]\n]", -1))
+        Program.logger.info('%s', '\n'.join(self.disassemble().lines(self.state.memory)))
         Program.logger.info('---   ---   ---')
 
-    def __populate_operations(self) -> None:
-        self.__operations = []
-        try :
-            self.__add_op_code_pos(self.op_factory.resolve(self.state, 0), 0)
-        except RuntimeError:
-            self.__operations = [['Error occurred when analysing state, raw state:'], self.state.memory]
-
-    def __add_op_code_pos(self, current_op: Operation, index: int) -> None:
-        next_op_start = current_op.next_op_start(index)
-        next_op = self.op_factory.resolve(self.state, next_op_start)
-        self.__operations.append(self.state.memory[index: next_op_start: 1])
-        if next_op.should_program_continue():
-            self.__add_op_code_pos(next_op, next_op_start)
-        else:
-            self.__operations.append(self.state.memory[index::])
-
     def __repr__(self) -> str:
         return f"{self.state}"
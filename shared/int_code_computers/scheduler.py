@@ -0,0 +1,139 @@
+import asyncio
+import logging as log
+from time import perf_counter
+from typing import List, Dict, Iterable, Sequence
+
+from shared.int_code_computers.channels import Channel, OutputSink, CollectingOutput
+from shared.int_code_computers.program import Program, Status
+
+
+class DeadlockError(RuntimeError):
+    pass
+
+
+class NetworkChannel(Channel):
+    # wakes up the machine reading from it whenever a value is written
+    written: asyncio.Event
+
+    def __init__(self, values: Iterable[int] = ()):
+        super().__init__(values)
+        self.written = asyncio.Event()
+
+    def write(self, value: int) -> None:
+        super().write(value)
+        self.written.set()
+
+
+class Broadcast(OutputSink):
+    sinks: List[OutputSink]
+
+    def __init__(self):
+        self.sinks = []
+
+    def write(self, value: int) -> None:
+        for sink in self.sinks:
+            sink.write(value)
+
+
+class MachineStats:
+    name: str
+    instructions: int
+    blocked_seconds: float
+    resumes: int
+
+    def __init__(self, name: str):
+        self.name = name
+        self.instructions = 0
+        self.blocked_seconds = 0.0
+        self.resumes = 0
+
+    def __repr__(self):
+        return f'{self.name}: instructions: {self.instructions}, blocked for: {self.blocked_seconds:.6f}s, ' \
+               f'resumed: {self.resumes} times'
+
+
+class Network:
+    logger = log.getLogger('Network')
+    machines: Dict[str, Program]
+    inputs: Dict[str, NetworkChannel]
+    outputs: Dict[str, Broadcast]
+    stats: Dict[str, MachineStats]
+
+    def __init__(self):
+        self.machines = {}
+        self.inputs = {}
+        self.outputs = {}
+        self.stats = {}
+        self.__waiting = set()
+        self.__halted = set()
+
+    def add(self, name: str, image: List[int], initial_inputs: Iterable[int] = ()) -> Program:
+        if name in self.machines:
+            raise RuntimeError(f'Machine {name} is already part of the network')
+        self.inputs[name] = NetworkChannel(initial_inputs)
+        self.outputs[name] = Broadcast()
+        self.stats[name] = MachineStats(name)
+        self.machines[name] = Program(image.copy(), self.inputs[name], self.outputs[name])
+        return self.machines[name]
+
+    def connect(self, source: str, target: str) -> None:
+        self.outputs[source].sinks.append(self.inputs[target])
+
+    def pipeline(self, names: Sequence[str]) -> None:
+        for source, target in zip(names, names[1:]):
+            self.connect(source, target)
+
+    def ring(self, names: Sequence[str]) -> None:
+        self.pipeline(names)
+        self.connect(names[-1], names[0])
+
+    def broadcast(self, source: str, targets: Iterable[str]) -> None:
+        for target in targets:
+            self.connect(source, target)
+
+    def collect(self, name: str) -> CollectingOutput:
+        collector = CollectingOutput()
+        self.outputs[name].sinks.append(collector)
+        return collector
+
+    def run(self) -> Dict[str, MachineStats]:
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> Dict[str, MachineStats]:
+        self.__waiting, self.__halted = set(), set()
+        tasks = [asyncio.ensure_future(self.__run_machine(name)) for name in self.machines]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        for stats in self.stats.values():
+            self.logger.info('%s', stats)
+        return self.stats
+
+    async def __run_machine(self, name: str) -> None:
+        program, inputs, stats = self.machines[name], self.inputs[name], self.stats[name]
+        while True:
+            executed = program.instructions_executed
+            program.run()
+            stats.instructions += program.instructions_executed - executed
+            if program.status == Status.HALTED:
+                self.__halted.add(name)
+                return
+            if len(inputs) > 0:
+                # input arrived while this machine was running, so it can carry on straight away
+                continue
+            inputs.written.clear()
+            self.__waiting.add(name)
+            if self.__is_deadlocked():
+                raise DeadlockError(f'Every machine in the network is halted or waiting for input, last was {name}')
+            started = perf_counter()
+            await inputs.written.wait()
+            stats.blocked_seconds += perf_counter() - started
+            stats.resumes += 1
+            self.__waiting.remove(name)
+
+    def __is_deadlocked(self) -> bool:
+        # machines that have been written to but not woken up yet still count as able to make progress
+        return len(self.__waiting) + len(self.__halted) == len(self.machines) \
+               and all(len(self.inputs[name]) == 0 for name in self.__waiting)
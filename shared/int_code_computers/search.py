@@ -0,0 +1,147 @@
+import logging as log
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import List, Tuple, Iterable, Iterator, Optional, Sequence
+
+from shared.int_code_computers.channels import InputSource, OutputSink
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.state import State
+
+Parameters = Tuple[int, ...]
+
+
+def noun_verb_pairs(limit: int = 100) -> List[Parameters]:
+    return list(product(range(limit), repeat=2))
+
+
+def noun_verb_ranges(limit: int = 100) -> List[range]:
+    return [range(limit), range(limit)]
+
+
+class ParameterSweep:
+    logger = log.getLogger('ParameterSweep')
+    image: List[int]
+    addresses: Tuple[int, ...]
+    # Instance mappings
+    __state: State
+    __program: Program
+
+    def __init__(self, image: List[int], addresses: Sequence[int] = (1, 2), inputs: InputSource = None,
+                 outputs: OutputSink = None):
+        self.image = list(image)
+        self.addresses = tuple(addresses)
+        # a single memory buffer is reused for every run, the image is copied back over it before each one. a slice
+        # copy is cheaper than keeping track of which cells each write touched
+        self.__state = State(self.image.copy(), inputs=inputs, outputs=outputs)
+        self.__program = Program.from_state(self.__state)
+
+    def run(self, parameters: Parameters) -> int:
+        self.__state.memory[:] = self.image
+        self.__state.index = 0
+        for address, value in zip(self.addresses, parameters):
+            self.__state.assign(address, value)
+        return self.__program.run()
+
+    @property
+    def instructions_executed(self) -> int:
+        return self.__program.instructions_executed
+
+    @property
+    def status(self) -> Status:
+        # of the last run
+        return self.__program.status
+
+    def results(self, candidates: Iterable[Parameters]) -> Iterator[Tuple[Parameters, int]]:
+        for parameters in candidates:
+            yield parameters, self.run(parameters)
+
+    def find(self, target: int, candidates: Iterable[Parameters]) -> Optional[Parameters]:
+        for parameters, result in self.results(candidates):
+            if result == target:
+                self.logger.debug('Parameters %s yield the target %s', parameters, target)
+                return parameters
+        return None
+
+
+def __find_in_chunk(image: List[int], addresses: Parameters, target: int,
+                    candidates: List[Parameters]) -> Optional[Parameters]:
+    return ParameterSweep(image, addresses).find(target, candidates)
+
+
+def parallel_find(image: List[int], target: int, candidates: Sequence[Parameters],
+                  addresses: Sequence[int] = (1, 2), workers: Optional[int] = None,
+                  chunk_size: int = 500) -> Optional[Parameters]:
+    chunks = [list(candidates[i:i + chunk_size]) for i in range(0, len(candidates), chunk_size)]
+    executor = ProcessPoolExecutor(workers)
+    try:
+        futures = [executor.submit(__find_in_chunk, image, tuple(addresses), target, chunk) for chunk in chunks]
+        # chunks are checked in order, so the match is the same one a serial search finds, whichever chunk finishes
+        # first
+        for index, future in enumerate(futures):
+            found = future.result()
+            if found is not None:
+                for later in futures[index + 1:]:
+                    later.cancel()
+                return found
+        return None
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def fit_affine(sweep: ParameterSweep, ranges: Sequence[range]) -> Optional[Tuple[int, ...]]:
+    # probes the program for result = sum(coefficient * parameter) + constant, the constant comes last
+    dimensions = len(ranges)
+    origin = tuple(r[0] for r in ranges)
+    try:
+        constant = sweep.run(origin)
+        coefficients = []
+        for dimension in range(dimensions):
+            probe = list(origin)
+            probe[dimension] = ranges[dimension][1]
+            step = ranges[dimension][1] - ranges[dimension][0]
+            difference = sweep.run(tuple(probe)) - constant
+            if difference % step != 0:
+                return None
+            coefficients.append(difference // step)
+        fitted = tuple(coefficients) + (constant - sum(c * o for c, o in zip(coefficients, origin)),)
+        checks = [tuple(r[-1] for r in ranges), tuple(r[len(r) // 2] for r in ranges),
+                  tuple(r[-1] if i % 2 == 0 else r[0] for i, r in enumerate(ranges))]
+        for check in checks:
+            if sweep.run(check) != evaluate_affine(fitted, check):
+                return None
+    except (TypeError, IndexError, RuntimeError) as e:
+        # i.e. parameters used as addresses out of memory, or in to a cell that doesn't hold an op code
+        ParameterSweep.logger.debug('Program could not be probed for an affine fit: %s', e)
+        return None
+    return fitted
+
+
+def evaluate_affine(fitted: Tuple[int, ...], parameters: Parameters) -> int:
+    return sum(c * p for c, p in zip(fitted, parameters)) + fitted[-1]
+
+
+def affine_solutions(fitted: Tuple[int, ...], target: int, ranges: Sequence[range]) -> Iterator[Parameters]:
+    # walks all but the last parameter in order, the last one is solved for directly
+    last_coefficient = fitted[len(ranges) - 1]
+    for leading in product(*ranges[:-1]):
+        remainder = target - fitted[-1] - sum(c * p for c, p in zip(fitted, leading))
+        if last_coefficient == 0:
+            if remainder == 0:
+                yield leading + (ranges[-1][0],)
+        elif remainder % last_coefficient == 0 and remainder // last_coefficient in ranges[-1]:
+            yield leading + (remainder // last_coefficient,)
+
+
+def solve_for(image: List[int], target: int, ranges: Sequence[range],
+              addresses: Sequence[int] = (1, 2), workers: Optional[int] = None) -> Optional[Parameters]:
+    sweep = ParameterSweep(image, addresses)
+    fitted = fit_affine(sweep, ranges)
+    if fitted is not None:
+        ParameterSweep.logger.info('Program result is affine in its parameters: %s', fitted)
+        # the fit is only checked at a handful of points, so nothing is trusted that wasn't run: not even the model
+        # having no solution
+        candidate = next(affine_solutions(fitted, target, ranges), None)
+        if candidate is not None and sweep.run(candidate) == target:
+            return candidate
+        ParameterSweep.logger.info('Affine fit gave no solution that held (%s), sweeping every candidate', candidate)
+    return parallel_find(image, target, list(product(*ranges)), addresses, workers)
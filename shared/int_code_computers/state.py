@@ -1,17 +1,208 @@
-from typing import List
+import copy
+from array import array
+from itertools import repeat
+from typing import List, Dict, Sequence, Union, Iterable, Tuple
+
+from shared.int_code_computers.channels import InputSource, OutputSink, ConsoleInput, LoggingOutput
+
+# addresses operations may use when memory grows on demand
+ADDRESS_LIMIT = 2 ** 63
+# how far past its end memory is grown, further writes are kept sparsely
+MIN_GROWTH = 1024
+# forks past this many layers of writes deep merge them back in to one, so reads don't have to look through them all
+MAX_LAYERS = 16
+
+
+def nonzero_cells(memory: Sequence[int]) -> Dict[int, int]:
+    # compares memories that grow: zero filled cells are the same as ones never written, wherever they're held
+    cells = dict(enumerate(memory))
+    if isinstance(memory, ArrayMemory):
+        cells.update(memory.sparse)
+    elif isinstance(memory, CopyOnWriteMemory):
+        cells.update(memory.changes())
+    return {address: value for address, value in cells.items() if value != 0}
+
+
+def freeze(memory: Sequence[int]) -> Sequence[int]:
+    # a compact, never modified copy of memory. values that don't fit in 64 bits keep it as python ints
+    try:
+        return array('q', memory)
+    except OverflowError:
+        return tuple(memory)
+
+
+class CopyOnWriteMemory:
+    # reads fall through this memory's own overlay, then the layers of writes it shares with the memories it was
+    # forked from & alongside, then a base shared with all of them. writes only land in its own overlay
+    base: Sequence[int]
+    overlay: Dict[int, int]
+    # writes made before each fork, oldest first. never modified once they're layers, so forks share them
+    layers: Tuple[Dict[int, int], ...]
+    # forked from an ArrayMemory: no upper bound, cells past the base read as 0
+    grows: bool
+
+    def __init__(self, base: Sequence[int], overlay: Dict[int, int] = None, layers: Tuple[Dict[int, int], ...] = (),
+                 grows: bool = False):
+        self.base = base
+        self.overlay = {} if overlay is None else overlay
+        self.layers = layers
+        self.grows = grows
+
+    def fork(self):
+        # this memory's own writes become a layer shared with the fork, so neither has to copy them
+        if len(self.overlay) > 0:
+            self.layers = self.layers + (self.overlay,)
+            self.overlay = {}
+        if len(self.layers) > MAX_LAYERS:
+            self.layers = (self.changes(),)
+        return CopyOnWriteMemory(self.base, None, self.layers, self.grows)
+
+    def changes(self) -> Dict[int, int]:
+        # every cell written since the base, over all the layers
+        changed = {}
+        for layer in self.layers:
+            changed.update(layer)
+        changed.update(self.overlay)
+        return changed
+
+    def copy(self) -> List[int]:
+        return list(self)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.base)))]
+        if index < 0:
+            if self.grows:
+                raise IndexError('memory index can not be negative')
+            index = index + len(self.base)
+        value = self.overlay.get(index)
+        if value is not None:
+            return value
+        for layer in reversed(self.layers):
+            value = layer.get(index)
+            if value is not None:
+                return value
+        if self.grows and index >= len(self.base):
+            return 0
+        return self.base[index]
+
+    def __setitem__(self, index: int, value: int):
+        if index < 0:
+            if self.grows:
+                raise IndexError('memory index can not be negative')
+            index = index + len(self.base)
+        if not self.grows and not 0 <= index < len(self.base):
+            raise IndexError('memory assignment index out of range')
+        self.overlay[index] = value
+
+    def __len__(self):
+        # like ArrayMemory, cells written past the base are left out
+        return len(self.base)
+
+    def __iter__(self):
+        changed = self.changes()
+        return (changed.get(index, value) for index, value in enumerate(self.base))
+
+    def __eq__(self, other):
+        if self.grows or isinstance(other, ArrayMemory):
+            return nonzero_cells(self) == nonzero_cells(other)
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class ArrayMemory:
+    # cells are packed in a typed array that grows (zero filled) when written past its end. cells far past the
+    # end are kept sparsely instead, so the gap in between is never allocated
+    cells: Union[array, List[int]]
+    sparse: Dict[int, int]
+
+    def __init__(self, memory: Iterable[int] = ()):
+        # an iterator would be partly used up by the time array overflows, so it's read once up front
+        values = list(memory)
+        try:
+            self.cells = array('q', values)
+        except OverflowError:
+            self.cells = values
+        self.sparse = {}
+
+    def copy(self):
+        memory = ArrayMemory()
+        memory.cells = self.cells[:]
+        memory.sparse = dict(self.sparse)
+        return memory
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return list(self.cells[index])
+        if 0 <= index < len(self.cells):
+            return self.cells[index]
+        if index < 0:
+            raise IndexError('memory index can not be negative')
+        return self.sparse.get(index, 0)
+
+    def __setitem__(self, index: int, value: int):
+        if index < 0:
+            raise IndexError('memory index can not be negative')
+        length = len(self.cells)
+        if index < length:
+            self.__store(index, value)
+        elif index < length + max(MIN_GROWTH, length):
+            self.cells.extend(repeat(0, index + 1 - length))
+            for address in [address for address in self.sparse if address <= index]:
+                self.__store(address, self.sparse.pop(address))
+            self.__store(index, value)
+        else:
+            self.sparse[index] = value
+
+    def __store(self, index: int, value: int):
+        try:
+            self.cells[index] = value
+        except OverflowError:
+            # falls back to python ints for values that don't fit in 64 bits
+            self.cells = list(self.cells)
+            self.cells[index] = value
+
+    def __len__(self):
+        # only the packed cells. sparse cells are left out of the length & iteration, the gap before them would have
+        # to be filled in, so anything copying memory has to take them over itself
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __eq__(self, other):
+        if isinstance(other, (ArrayMemory, CopyOnWriteMemory)):
+            return nonzero_cells(self) == nonzero_cells(other)
+        # sparse cells count, a sparse zero being the same as a cell never written
+        return all(value == 0 for value in self.sparse.values()) and list(self.cells) == list(other)
+
+    def __repr__(self):
+        return repr(list(self)) + (f' + {self.sparse}' if self.sparse else '')
 
 
 class State:
     memory: List[int]
     mem_length: int
     index: int
+    inputs: InputSource
+    outputs: OutputSink
+    # counts writes made through assign, so anything worked out from memory can tell when it's out of date
+    writes: int
 
-    def __init__(self, memory: List[int], start_index=0):
+    def __init__(self, memory: List[int], start_index=0, inputs: InputSource = None, outputs: OutputSink = None):
         self.memory = memory
-        self.mem_length = len(memory)
+        # memory that grows on demand has no end for operations to check against
+        self.mem_length = ADDRESS_LIMIT if isinstance(memory, ArrayMemory) \
+            or isinstance(memory, CopyOnWriteMemory) and memory.grows else len(memory)
         self.index = start_index
+        self.inputs = ConsoleInput() if inputs is None else inputs
+        self.outputs = LoggingOutput() if outputs is None else outputs
+        self.writes = 0
 
     def assign(self, at: int, data: int):
+        self.writes += 1
         self.memory[at] = data
 
     def at(self, index: int) -> int:
@@ -26,7 +217,43 @@ class State:
     def increase_index(self, op_length: int):
         self.index = self.index + op_length
 
+    def snapshot(self):
+        memory = self.memory
+        if isinstance(memory, CopyOnWriteMemory):
+            return Snapshot(memory.base, memory.changes(), self.index, memory.grows)
+        if isinstance(memory, ArrayMemory):
+            return Snapshot(freeze(memory.cells), dict(memory.sparse), self.index, True)
+        return Snapshot(freeze(memory), {}, self.index)
+
+    def fork(self):
+        # the same kind of state, carrying on with the same channels. cheap for copy on write memory, otherwise a
+        # snapshot is taken and that's forked instead
+        state = copy.copy(self)
+        if isinstance(self.memory, CopyOnWriteMemory):
+            state.memory = self.memory.fork()
+        else:
+            state.memory = self.snapshot().fork().memory
+        return state
+
     def __repr__(self):
         return f"State: index: {self.index}. current operation: {self.current_op()}." \
                f"\n *All instructions: {self.memory}"
 
+
+class Snapshot:
+    base: Sequence[int]
+    # never modified, every fork shares it as its first layer
+    overlay: Dict[int, int]
+    index: int
+    grows: bool
+
+    def __init__(self, base: Sequence[int], overlay: Dict[int, int], index: int, grows: bool = False):
+        self.base = base
+        self.overlay = overlay
+        self.index = index
+        self.grows = grows
+
+    def fork(self) -> State:
+        return State(CopyOnWriteMemory(self.base, None, (self.overlay,) if len(self.overlay) > 0 else (), self.grows),
+                     self.index)
+
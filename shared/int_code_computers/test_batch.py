@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from shared.int_code_computers.batch import run_batch, run_job
+from shared.int_code_computers.program import Status
+from shared.int_code_computers.test_channels import ADD_INPUTS
+
+
+class TestBatch(TestCase):
+
+    def test_run_job(self):
+        result = run_job(ADD_INPUTS, 0, (2, 3))
+        self.assertEqual([5], result.outputs)
+        self.assertEqual(Status.HALTED, result.status)
+        self.assertEqual(Status.AWAITING_INPUT, run_job(ADD_INPUTS, 1, (2,)).status)
+
+    def test_run_job_reports_errors(self):
+        result = run_job([50, 0, 0], 0, ())
+        self.assertIsNone(result.result)
+        self.assertIn('RuntimeError', result.error)
+
+    def test_run_batch(self):
+        jobs = [(i, i * 2) for i in range(100)]
+        results = sorted(run_batch(ADD_INPUTS, jobs, workers=2, chunk_size=16), key=lambda r: r.job_id)
+        self.assertEqual(100, len(results))
+        for i, result in enumerate(results):
+            self.assertEqual((i, i * 2), result.inputs)
+            self.assertEqual([i * 3], result.outputs)
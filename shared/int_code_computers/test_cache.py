@@ -0,0 +1,107 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from shared.int_code_computers.cache import ResultCache, HashedState, memory_hash
+from shared.int_code_computers.channels import Channel, IterableInput
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.state import ArrayMemory, CopyOnWriteMemory, freeze
+from shared.int_code_computers.test_channels import ADD_INPUTS
+
+
+class TestResultCache(TestCase):
+
+    def run_cached(self, cache, inputs, image=ADD_INPUTS):
+        p = Program(list(image), Channel(inputs), Channel(), cache=cache)
+        p.run()
+        return p
+
+    def test_hit_replays_run(self):
+        cache = ResultCache()
+        executed = self.run_cached(cache, [2, 3])
+        replayed = self.run_cached(cache, [2, 3])
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual([5], list(replayed.state.outputs.values))
+        self.assertEqual(executed.state.memory, replayed.state.memory)
+        self.assertEqual(executed.state.index, replayed.state.index)
+        self.assertEqual(4, replayed.instructions_executed)
+        self.assertEqual(Status.HALTED, replayed.status)
+
+    def test_different_inputs_miss(self):
+        cache = ResultCache()
+        self.run_cached(cache, [2, 3])
+        self.assertEqual([7], list(self.run_cached(cache, [3, 4]).state.outputs.values))
+        self.assertEqual(2, cache.misses)
+
+    def test_unread_inputs_left_alone(self):
+        cache = ResultCache()
+        self.run_cached(cache, [2, 3, 9])
+        self.assertEqual([9], list(self.run_cached(cache, [2, 3, 9]).state.inputs.values))
+
+    def test_paused_runs_not_cached(self):
+        cache = ResultCache()
+        p = self.run_cached(cache, [2])
+        self.assertEqual(Status.AWAITING_INPUT, p.status)
+        self.assertEqual(0, len(cache))
+        p.state.inputs.write(3)
+        p.run()
+        self.assertEqual([5], list(p.state.outputs.values))
+        self.assertEqual(1, len(cache))
+
+    def test_unkeyable_inputs_run_uncached(self):
+        cache = ResultCache()
+        p = Program(ADD_INPUTS.copy(), IterableInput([2, 3]), Channel(), cache=cache)
+        p.run()
+        self.assertEqual([5], list(p.state.outputs.values))
+        self.assertEqual((0, 0, 0), (cache.hits, cache.misses, len(cache)))
+
+    def test_lru_eviction(self):
+        cache = ResultCache(capacity=2)
+        self.run_cached(cache, [1, 1])
+        self.run_cached(cache, [2, 2])
+        self.run_cached(cache, [1, 1])
+        self.run_cached(cache, [3, 3])
+        self.assertEqual(2, len(cache))
+        self.run_cached(cache, [1, 1])
+        self.assertEqual(2, cache.hits)
+
+    def test_disk_store(self):
+        with TemporaryDirectory() as directory:
+            self.run_cached(ResultCache(directory=directory), [2, 3])
+            self.assertEqual(1, len(os.listdir(directory)))
+            cache = ResultCache(directory=directory)
+            self.assertEqual([5], list(self.run_cached(cache, [2, 3]).state.outputs.values))
+            self.assertEqual(1, cache.hits)
+
+    def test_incremental_hash(self):
+        state = HashedState(ADD_INPUTS.copy())
+        original = state.memory_hash()
+        state.assign(11, 4)
+        state.assign(12, 0)
+        state.assign(11, 5)
+        # the same memory, reached by different writes, hashes the same
+        other = HashedState(ADD_INPUTS.copy())
+        other.assign(11, 5)
+        self.assertEqual(other.memory_hash(), state.memory_hash())
+        self.assertEqual([], state.written)
+        state.assign(11, 0)
+        self.assertEqual([11], state.written)
+        self.assertEqual(original, state.memory_hash())
+
+    def test_copy_on_write_hash(self):
+        # forks of one base share its hash, writes on top are hashed per cell
+        base = freeze(ADD_INPUTS)
+        memory = CopyOnWriteMemory(base)
+        memory[11] = 5
+        state = HashedState(CopyOnWriteMemory(base))
+        state.assign(11, 5)
+        self.assertEqual(memory_hash(memory), state.memory_hash())
+        self.assertNotEqual(memory_hash(CopyOnWriteMemory(base)), state.memory_hash())
+        self.assertEqual(memory_hash(ADD_INPUTS), memory_hash(CopyOnWriteMemory(base)))
+
+    def test_grown_memory_hashes_the_same(self):
+        memory = ArrayMemory([1, 2, 3])
+        memory[10] = 0
+        self.assertEqual(memory_hash([1, 2, 3]), memory_hash(memory))
+        memory[10 ** 6] = 5
+        self.assertNotEqual(memory_hash([1, 2, 3]), memory_hash(memory))
@@ -0,0 +1,68 @@
+import asyncio
+from unittest import TestCase
+
+from shared.int_code_computers.channels import AwaitingInput, IterableInput, Channel, CollectingOutput, \
+    CoroutineOutput, AsyncQueueChannel
+from shared.int_code_computers.compiler import CompiledProgram
+from shared.int_code_computers.program import Program, Status
+
+# reads two inputs in to positions 11 & 12, then outputs their sum
+ADD_INPUTS = [3, 11, 3, 12, 1, 11, 12, 13, 4, 13, 99, 0, 0, 0]
+
+
+class TestChannels(TestCase):
+
+    def test_iterable_input(self):
+        outputs = CollectingOutput()
+        p = Program(ADD_INPUTS.copy(), IterableInput(x for x in [5, 6]), outputs)
+        p.run()
+        self.assertEqual(Status.HALTED, p.status)
+        self.assertEqual([11], outputs.values)
+
+    def test_pauses_while_awaiting_input(self):
+        inputs, outputs = Channel(), Channel()
+        p = Program(ADD_INPUTS.copy(), inputs, outputs)
+        p.run()
+        self.assertEqual(Status.AWAITING_INPUT, p.status)
+        self.assertEqual(0, p.state.index)
+        inputs.write(5)
+        p.run()
+        self.assertEqual(Status.AWAITING_INPUT, p.status)
+        self.assertEqual(2, p.state.index)
+        inputs.write(6)
+        p.run()
+        self.assertEqual(Status.HALTED, p.status)
+        self.assertEqual(11, outputs.read())
+        self.assertRaises(AwaitingInput, outputs.read)
+
+    def test_compiled_program_pauses_while_awaiting_input(self):
+        inputs, outputs = Channel([5]), Channel()
+        p = CompiledProgram(ADD_INPUTS.copy(), inputs, outputs)
+        p.run()
+        self.assertEqual(Status.AWAITING_INPUT, p.status)
+        inputs.write(6)
+        p.run()
+        self.assertEqual(Status.HALTED, p.status)
+        self.assertEqual([11], list(outputs.values))
+
+    def test_coroutine_output(self):
+        received = []
+
+        def receiver():
+            while True:
+                received.append((yield))
+
+        Program(ADD_INPUTS.copy(), Channel([1, 2]), CoroutineOutput(receiver())).run()
+        self.assertEqual([3], received)
+
+    def test_async_queue_channel(self):
+        async def feed_program():
+            inputs, outputs = AsyncQueueChannel(), AsyncQueueChannel()
+            p = Program(ADD_INPUTS.copy(), inputs, outputs)
+            p.run()
+            await inputs.queue.put(7)
+            await inputs.queue.put(8)
+            p.run()
+            return await outputs.queue.get()
+
+        self.assertEqual(15, asyncio.run(feed_program()))
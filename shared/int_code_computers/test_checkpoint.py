@@ -0,0 +1,95 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from shared.int_code_computers.channels import Channel, CollectingOutput, IterableInput
+from shared.int_code_computers.checkpoint import dumps, loads, save, restore
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.state import State, ArrayMemory
+from shared.int_code_computers.test_channels import ADD_INPUTS
+
+
+class TestCheckpoint(TestCase):
+
+    def test_resume_paused_program(self):
+        p = Program(ADD_INPUTS.copy(), Channel([2]), CollectingOutput())
+        p.run()
+        self.assertEqual(Status.AWAITING_INPUT, p.status)
+        restored = loads(dumps(p, ADD_INPUTS), ADD_INPUTS)
+        self.assertEqual(Status.AWAITING_INPUT, restored.status)
+        self.assertEqual(1, restored.instructions_executed)
+        self.assertEqual(p.state.memory, restored.state.memory)
+        restored.state.inputs.write(3)
+        restored.run()
+        self.assertEqual([5], restored.state.outputs.values)
+        self.assertEqual(4, restored.instructions_executed)
+
+    def test_pending_io(self):
+        p = Program(ADD_INPUTS.copy(), Channel([2, 3, 4]), Channel([7]))
+        p.run()
+        restored = loads(dumps(p, ADD_INPUTS), ADD_INPUTS)
+        self.assertEqual([4], list(restored.state.inputs.values))
+        self.assertEqual([7, 5], list(restored.state.outputs.values))
+        self.assertEqual(Status.HALTED, restored.status)
+
+    def test_delta_against_image(self):
+        image = [1, 0, 0, 0, 99] + [0] * 1000
+        p = Program(image.copy(), Channel(), Channel())
+        p.run()
+        with_image = dumps(p, image)
+        self.assertLess(len(with_image), len(dumps(p)))
+        self.assertEqual(p.state.memory, loads(dumps(p), ()).state.memory)
+
+    def test_wrong_image(self):
+        p = Program(ADD_INPUTS.copy(), Channel(), Channel())
+        data = dumps(p, ADD_INPUTS)
+        self.assertRaises(RuntimeError, loads, data, [1, 0, 0, 0, 99])
+        self.assertRaises(RuntimeError, loads, data[:-1], ADD_INPUTS)
+        self.assertRaises(RuntimeError, loads, b'nope' + data[4:], ADD_INPUTS)
+
+    def test_large_and_negative_values(self):
+        image = [1101, -5, 2 ** 70, 5, 99, 0]
+        p = Program(image.copy(), Channel(), Channel())
+        p.run()
+        self.assertEqual(2 ** 70 - 5, loads(dumps(p, image), image).state.at(5))
+
+    def test_array_memory(self):
+        memory = ArrayMemory([1101, 2, 3, 5000, 99])
+        p = Program.from_state(State(memory, inputs=Channel(), outputs=Channel()))
+        p.run()
+        memory[10 ** 9] = 8
+        restored = loads(dumps(p, [1101, 2, 3, 5000, 99]), [1101, 2, 3, 5000, 99]).state.memory
+        self.assertIsInstance(restored, ArrayMemory)
+        self.assertEqual(5, restored[5000])
+        self.assertEqual(8, restored[10 ** 9])
+
+    def test_copy_on_write_memory(self):
+        state = State(ADD_INPUTS.copy()).fork()
+        state.inputs, state.outputs = Channel([4, 5]), Channel()
+        p = Program.from_state(state)
+        p.run()
+        restored = loads(dumps(p, ADD_INPUTS), ADD_INPUTS).state.memory
+        self.assertEqual({11: 4, 12: 5, 13: 9}, restored.overlay)
+
+    def test_growing_copy_on_write_memory(self):
+        state = State(ArrayMemory([1101, 2, 3, 10, 99]), inputs=Channel(), outputs=Channel()).fork()
+        state.assign(10 ** 9, 8)
+        p = Program.from_state(state)
+        p.run()
+        restored = loads(dumps(p, [1101, 2, 3, 10, 99]), [1101, 2, 3, 10, 99]).state.memory
+        self.assertTrue(restored.grows)
+        self.assertEqual(state.memory, restored)
+        self.assertEqual(8, restored[10 ** 9])
+
+    def test_unsupported_channel(self):
+        p = Program(ADD_INPUTS.copy(), IterableInput([1]), Channel())
+        self.assertRaises(RuntimeError, dumps, p)
+
+    def test_save_and_restore(self):
+        p = Program(ADD_INPUTS.copy(), Channel([2]), Channel())
+        p.run()
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'machine.ick')
+            save(p, path, ADD_INPUTS)
+            self.assertEqual(['machine.ick'], os.listdir(directory))
+            self.assertEqual(2, restore(path, ADD_INPUTS).state.at(11))
@@ -0,0 +1,141 @@
+from random import Random
+from typing import List
+from unittest import TestCase
+
+from shared.int_code_computers.channels import Channel, CollectingOutput
+from shared.int_code_computers.compiler import CompiledProgram
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.state import ArrayMemory
+
+
+class StepLimit:
+    # stands in for a tracer, to stop the interpreter on programs that never halt
+    steps: int
+
+    def __init__(self, steps: int):
+        self.steps = steps
+
+    def before(self, state, op):
+        self.steps -= 1
+        if self.steps < 0:
+            raise TimeoutError('Program did not halt')
+
+    def after(self, state):
+        pass
+
+
+class TestCompiledProgram(TestCase):
+
+    def assert_same_as_interpreter(self, program_code: List[int]):
+        interpreted = Program(program_code.copy())
+        compiled = CompiledProgram(program_code.copy())
+        self.assertEqual(interpreted.run(), compiled.run())
+        self.assertEqual(interpreted.state.memory, compiled.state.memory)
+        self.assertEqual(interpreted.state.index, compiled.state.index)
+        self.assertEqual(interpreted.instructions_executed, compiled.instructions_executed)
+
+    def assert_same_outcome(self, program_code: List[int]):
+        # for programs that may fail, or pause on an input. the interpreter gives up on programs that don't halt
+        try:
+            expected = TestCompiledProgram.__outcome(Program(program_code.copy(), Channel(), Channel(),
+                                                             tracer=StepLimit(1000)))
+        except TimeoutError:
+            return
+        self.assertEqual(expected, TestCompiledProgram.__outcome(CompiledProgram(program_code.copy(), Channel(),
+                                                                                 Channel())), program_code)
+
+    @staticmethod
+    def __outcome(program: Program):
+        try:
+            result = program.run(), program.status
+        except (TypeError, IndexError, RuntimeError) as e:
+            result = type(e)
+        return result, list(program.state.memory), program.state.index, program.instructions_executed
+
+    def test_addresses_outside_memory(self):
+        # negative addresses are read as None, like any other address outside memory, so the addition fails
+        self.assertRaises(TypeError, CompiledProgram([1, -1, 0, 0, 99]).run)
+        self.assert_same_outcome([1, -1, 0, 0, 99])
+        # None is never equal, so 0 is written
+        self.assert_same_as_interpreter([8, -1, 9, 0, 99, 0, 0, 0, 0, 99])
+        self.assert_same_outcome([7, 4, 100, 0, 99])
+        self.assert_same_outcome([1105, 1, 7, 1006, 100, 10, 99, 1005, 0, 3, 99])
+
+    def test_same_as_interpreter_on_random_programs(self):
+        rng = Random(2019)
+        for _ in range(1000):
+            length = rng.randint(4, 24)
+            program_code = []
+            while len(program_code) < length:
+                op_code = rng.choice((1, 2, 5, 6, 7, 8, 99))
+                program_code.append(op_code + 100 * rng.randint(0, 1) + 1000 * rng.randint(0, 1)
+                                    + 10000 * rng.randint(0, 1))
+                program_code += [rng.randint(-2, length + 2) for _ in range({1: 3, 2: 3, 7: 3, 8: 3}.get(op_code, 2))]
+            self.assert_same_outcome(program_code)
+
+    def test_simple_programs(self):
+        self.assert_same_as_interpreter([1, 0, 0, 0, 99])
+        self.assert_same_as_interpreter([2, 4, 4, 5, 99, 0])
+        self.assert_same_as_interpreter([1, 9, 10, 3, 2, 3, 11, 0, 99, 30, 40, 50])
+
+    def test_fake_halt(self):
+        # the first operation turns the halt at position 4 in to a multiplication
+        self.assert_same_as_interpreter([1, 1, 1, 4, 99, 5, 6, 0, 99])
+
+    def test_self_modifying_block(self):
+        #                  0,   1,   2, 3,    4, 5, 6, 7,  8
+        program_code = [1101, 100, -99, 4, 1102, 5, 6, 0, 99]
+        # the first operation turns the multiplication at 4 in to an addition in position mode: 5 + 6
+        p = CompiledProgram(program_code)
+        self.assertEqual(11, p.run())
+        self.assert_same_as_interpreter([1101, 100, -99, 4, 1102, 5, 6, 0, 99])
+
+    def test_loop(self):
+        program_code = [1101, 0, 0, 20, 1001, 21, -1, 21, 1001, 20, 2, 20, 1005, 21, 4, 1002, 20, 1, 0, 99, 0, 10]
+        # adds 2 to position 20 while counting position 21 down to 0
+        p = CompiledProgram(program_code.copy())
+        self.assertEqual(20, p.run())
+        self.assert_same_as_interpreter(program_code)
+
+    def test_day_2_program(self):
+        program_code = [1, 0, 0, 3, 1, 1, 2, 3, 1, 3, 4, 3, 1, 5, 0, 3, 2, 6, 1, 19, 1, 5, 19, 23, 2, 6, 23, 27, 1, 27,
+                        5, 31, 2, 9, 31, 35, 1, 5, 35, 39, 2, 6, 39, 43, 2, 6, 43, 47, 1, 5, 47, 51, 2, 9, 51, 55, 1, 5,
+                        55, 59, 1, 10, 59, 63, 1, 63, 6, 67, 1, 9, 67, 71, 1, 71, 6, 75, 1, 75, 13, 79, 2, 79, 13, 83,
+                        2, 9, 83, 87, 1, 87, 5, 91, 1, 9, 91, 95, 2, 10, 95, 99, 1, 5, 99, 103, 1, 103, 9, 107, 1, 13,
+                        107, 111, 2, 111, 10, 115, 1, 115, 5, 119, 2, 13, 119, 123, 1, 9, 123, 127, 1, 5, 127, 131, 2,
+                        131, 6, 135, 1, 135, 5, 139, 1, 139, 6, 143, 1, 143, 6, 147, 1, 2, 147, 151, 1, 151, 5, 0, 99,
+                        2, 14, 0, 0]
+        program_code[1:3] = [56, 96]
+        self.assertEqual(19690720, CompiledProgram(program_code.copy()).run())
+        self.assert_same_as_interpreter(program_code)
+
+    def test_array_memory(self):
+        # 2 + 3 stored past the end of the program, then memory[0] = memory[20] + memory[10] -> 0 + 5
+        for program_type in (Program, CompiledProgram):
+            p = program_type(ArrayMemory([1101, 2, 3, 10, 1, 20, 10, 0, 99]))
+            self.assertEqual(5, p.run())
+            self.assertEqual(5, p.state.at(10))
+
+    def test_input_past_the_image(self):
+        # input is stored at 100, past the end of the image, then output from there
+        outputs = CollectingOutput()
+        p = CompiledProgram(ArrayMemory([3, 100, 4, 100, 99]), Channel([5]), outputs)
+        p.run()
+        self.assertEqual([5], outputs.values)
+        self.assertEqual(5, p.state.at(100))
+
+    def test_fork(self):
+        #             0, 1, 2,  3, 4, 5,    6, 7, 8
+        program_code = [1101, 1, 1, 20, 3, 0, 1105, 1, 0] + [0] * 12
+        # stores 2 at 20, then reads an input over the op code at 0 and jumps back to it
+        p = CompiledProgram(program_code, Channel(), CollectingOutput())
+        p.run()
+        fork = p.fork(Channel([99]))
+        self.assertIsInstance(fork, CompiledProgram)
+        self.assertIs(p.state.outputs, fork.state.outputs)
+        # the input written over the translated block at 0 only invalidates the fork's translation of it
+        self.assertEqual(99, fork.run())
+        self.assertEqual(Status.HALTED, fork.status)
+        p.state.inputs.write(1101)
+        self.assertEqual(1101, p.run())
+        self.assertEqual(Status.AWAITING_INPUT, p.status)
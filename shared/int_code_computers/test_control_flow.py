@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from shared.int_code_computers.compiler import CompiledProgram
+from shared.int_code_computers.control_flow import ControlFlowGraph, Loop
+from shared.int_code_computers.operations import OperationFactory
+
+# adds 2 to position 20 while counting position 21 down to 0
+LOOP = [1101, 0, 0, 20, 1001, 21, -1, 21, 1001, 20, 2, 20, 1005, 21, 4, 1002, 20, 1, 0, 99, 0, 10]
+
+
+class TestControlFlowGraph(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = OperationFactory()
+
+    def test_basic_blocks_and_loops(self):
+        graph = ControlFlowGraph(LOOP, self.factory)
+        self.assertEqual([0, 4, 15], sorted(graph.blocks))
+        self.assertEqual([4], graph.blocks[0].successors)
+        self.assertEqual([4, 15], sorted(graph.blocks[4].successors))
+        self.assertEqual([], graph.blocks[15].successors)
+        self.assertEqual([Loop(4, 4)], graph.loops)
+        self.assertEqual({4}, graph.loop_blocks(graph.loops[0]))
+        self.assertEqual({0, 20, 21}, graph.written)
+        self.assertEqual([(20, 22)], graph.unreachable)
+
+    def test_self_modification(self):
+        # the first operation turns the halt at position 4 in to a multiplication
+        graph = ControlFlowGraph([1, 1, 1, 4, 99, 5, 6, 0, 99], self.factory)
+        self.assertEqual({4}, graph.self_modified)
+
+    def test_position_mode_target_of_constant_cell(self):
+        #            0, 1, 2,  3,  4, 5
+        memory = [105, 1, 5, 99, 99, 4]
+        graph = ControlFlowGraph(memory, self.factory)
+        self.assertEqual([0, 4], sorted(graph.instructions))
+        self.assertFalse(graph.blocks[0].indirect)
+        self.assertEqual([(3, 4), (5, 6)], graph.unreachable)
+
+    def test_position_mode_target_of_written_cell(self):
+        #             0, 1, 2, 3,   4, 5, 6,  7,  8, 9
+        memory = [1101, 0, 4, 9, 105, 1, 9, 99, 99, 0]
+        graph = ControlFlowGraph(memory, self.factory)
+        self.assertEqual([0, 4], sorted(graph.instructions))
+        self.assertTrue(graph.blocks[0].indirect)
+
+    def test_precompile(self):
+        program = CompiledProgram(LOOP.copy())
+        self.assertEqual(3, program.precompile())
+        self.assertEqual(20, program.run())
+
+    def test_self_modification_of_undecodable_cell(self):
+        # position 4 only holds a valid op code (a halt) once the first operation has written it
+        graph = ControlFlowGraph([1101, 90, 9, 4, 0], self.factory)
+        self.assertEqual({4}, graph.self_modified)
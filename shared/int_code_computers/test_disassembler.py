@@ -0,0 +1,63 @@
+import sys
+from unittest import TestCase
+
+from shared.int_code_computers.compiler import CompiledProgram
+from shared.int_code_computers.control_flow import disassemble
+from shared.int_code_computers.disassembler import Instruction
+from shared.int_code_computers.operations import OperationFactory
+from shared.int_code_computers.program import Program
+from shared.int_code_computers.state import ArrayMemory
+
+
+class TestDisassembler(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = OperationFactory()
+
+    def test_instruction_records(self):
+        disassembly = disassemble([1002, 4, 3, 4, 99], self.factory)
+        first, halt = disassembly.instructions
+        self.assertEqual((0, 'MUL', 1002, (0, 1, 0), (4, 3, 4)), tuple(first)[0:5])
+        self.assertEqual('     0: MUL  @4, #3, @4', str(first))
+        self.assertEqual(4, halt.address)
+        self.assertEqual([], disassembly.data)
+
+    def test_data_after_halt(self):
+        disassembly = disassemble([2, 4, 4, 5, 99, 0], self.factory)
+        self.assertEqual([0, 4], [instruction.address for instruction in disassembly.instructions])
+        self.assertEqual([(5, 6)], disassembly.data)
+
+    def test_jumps_over_data(self):
+        #            0, 1, 2,  3,  4,    5, 6, 7, 8,  9
+        memory = [1105, 1, 5, 42, 42, 1101, 1, 1, 0, 99]
+        disassembly = disassemble(memory, self.factory)
+        self.assertEqual([0, 5, 9], [instruction.address for instruction in disassembly.instructions])
+        self.assertEqual([(3, 5)], disassembly.data)
+        self.assertEqual('     3: DATA [42, 42]', disassembly.lines(memory)[1])
+
+    def test_large_program_does_not_recurse(self):
+        memory = [1101, 0, 0, 0] * sys.getrecursionlimit() + [99]
+        disassembly = disassemble(memory, self.factory)
+        self.assertEqual(sys.getrecursionlimit() + 1, len(disassembly.instructions))
+
+    def test_program_disassembles_on_request(self):
+        program = Program([1101, 2, 3, 0, 99])
+        first = program.disassemble()
+        self.assertIs(first, program.disassemble())
+        program.run()
+        # memory changed, so the disassembly is redone
+        self.assertIsNot(first, program.disassemble())
+        self.assertIsInstance(program.disassemble().instructions[0], Instruction)
+
+    def test_sparse_writes_redo_disassembly(self):
+        program = Program(ArrayMemory([1101, 2, 3, 0, 99]))
+        first = program.disassemble()
+        program.state.assign(10 ** 9, 5)
+        self.assertIsNot(first, program.disassemble())
+
+    def test_compiled_runs_redo_disassembly(self):
+        program = CompiledProgram([1101, 2, 3, 0, 99])
+        first = program.disassemble()
+        program.run()
+        self.assertIsNot(first, program.disassemble())
@@ -0,0 +1,94 @@
+import os
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from shared.int_code_computers import loader
+from shared.int_code_computers.loader import ImageLoader, parse
+from shared.int_code_computers.program import Program
+from shared.int_code_computers.state import ArrayMemory
+
+
+class TestLoader(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'input.txt')
+        with open(self.path, 'w') as target:
+            target.write('1,9,10,3,2,3,11,0,99,30,40,50\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_parse_across_chunks(self):
+        memory = parse(BytesIO(b'1002,4,3,4,33\n'), chunk_size=3)
+        self.assertIsInstance(memory, ArrayMemory)
+        self.assertEqual([1002, 4, 3, 4, 33], list(memory))
+
+    def test_parse_large_values(self):
+        self.assertEqual([1, -2, 2 ** 70, 4], list(parse(BytesIO(f'1,-2,{2 ** 70},4'.encode()), chunk_size=4)))
+
+    def test_parse_empty(self):
+        self.assertEqual([], list(parse(BytesIO(b''))))
+        self.assertEqual([], list(parse(BytesIO(b'\n'))))
+
+    def test_load_path_runs(self):
+        p = Program(ImageLoader(None).load(self.path))
+        p.run()
+        self.assertEqual(3500, p.state.at(0))
+
+    def test_loads_are_independent(self):
+        image_loader = ImageLoader(None)
+        image_loader.load(self.path)[0] = 5
+        self.assertEqual(1, image_loader.load(self.path)[0])
+        self.assertEqual(1, image_loader.parsed)
+
+    def test_reparsed_once_changed(self):
+        image_loader = ImageLoader(None)
+        image_loader.load(self.path)
+        with open(self.path, 'w') as target:
+            target.write('1,0,0,0,99,7')
+        self.assertEqual([1, 0, 0, 0, 99, 7], list(image_loader.load(self.path)))
+        self.assertEqual(2, image_loader.parsed)
+        # the version parsed before the change isn't held on to
+        self.assertEqual(1, image_loader.images_held)
+
+    def test_disk_cache_shared_between_loaders(self):
+        cache_directory = os.path.join(self.directory.name, 'cache')
+        ImageLoader(cache_directory).load(self.path)
+        image_loader = ImageLoader(cache_directory)
+        self.assertEqual([1, 9, 10, 3, 2, 3, 11, 0, 99, 30, 40, 50], list(image_loader.load(self.path)))
+        self.assertEqual(0, image_loader.parsed)
+
+    def test_disk_cache_is_opt_in(self):
+        self.assertIsNone(ImageLoader().directory)
+
+    def test_bad_disk_cache_reparsed(self):
+        cache_directory = os.path.join(self.directory.name, 'cache')
+        ImageLoader(cache_directory).load(self.path)
+        cached_path = os.path.join(cache_directory, os.listdir(cache_directory)[0])
+        with open(cached_path, 'rb') as cached:
+            contents = cached.read()
+        # truncated part way through a cell, then from the same contents at a different modification time
+        for damaged, modified in ((contents[:-3], None), (contents, (0, 1))):
+            with open(cached_path, 'wb') as cached:
+                cached.write(damaged)
+            if modified is not None:
+                os.utime(self.path, ns=modified)
+            image_loader = ImageLoader(cache_directory)
+            self.assertEqual([1, 9, 10, 3, 2, 3, 11, 0, 99, 30, 40, 50], list(image_loader.load(self.path)))
+            self.assertEqual(1, image_loader.parsed)
+
+    def test_memory_mapped(self):
+        original_threshold = loader.MMAP_THRESHOLD
+        loader.MMAP_THRESHOLD = 0
+        try:
+            self.assertEqual(12, len(ImageLoader(None).load(self.path)))
+        finally:
+            loader.MMAP_THRESHOLD = original_threshold
+
+    def test_load_stream(self):
+        with open(self.path, 'rb') as source:
+            self.assertEqual(50, ImageLoader(None).load(source)[11])
@@ -0,0 +1,65 @@
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from shared.int_code_computers.lockstep import LockstepSweep, np
+from shared.int_code_computers.search import ParameterSweep, noun_verb_pairs
+
+# the day 2 example: adds, then multiplies the cells noun & verb point at
+EXAMPLE = [1, 9, 10, 3, 2, 3, 11, 0, 99, 30, 40, 50]
+# counts down from noun + verb, multiplying cell 2 (the verb) by 3 every time round, then stores it in cell 0
+TRIPLE_COUNT_DOWN = [1101, 0, 0, 1, 1001, 1, -1, 1, 1002, 2, 3, 2, 1005, 1, 4, 1001, 2, 0, 0, 99]
+# the same, but squares cell 2 instead
+SQUARE_COUNT_DOWN = [1101, 0, 0, 1, 1001, 1, -1, 1, 2, 2, 2, 2, 1005, 1, 4, 1001, 2, 0, 0, 99]
+
+
+class TestLockstepSweep(TestCase):
+
+    def assertSameAsScalar(self, image, candidates):
+        lockstep = LockstepSweep(image)
+        self.assertEqual([result for _, result in ParameterSweep(image).results(candidates)],
+                         lockstep.run(candidates))
+        return lockstep
+
+    def test_same_results_as_scalar(self):
+        self.assertSameAsScalar(EXAMPLE, noun_verb_pairs(12))
+
+    def test_diverging_machines(self):
+        candidates = [(count, 1) for count in range(20)]
+        results = self.assertSameAsScalar(TRIPLE_COUNT_DOWN, candidates).run(candidates)
+        self.assertEqual([3 ** (count + 1) for count in range(20)], results)
+
+    def test_overflow_falls_back(self):
+        candidates = [(0, 3), (1, 3), (3, 3)]
+        self.assertEqual(3 ** 2 ** 6, self.assertSameAsScalar(SQUARE_COUNT_DOWN, candidates).run(candidates)[2])
+
+    def test_find(self):
+        self.assertEqual(ParameterSweep(EXAMPLE).find(3500, noun_verb_pairs(12)),
+                         LockstepSweep(EXAMPLE).find(3500, noun_verb_pairs(12)))
+        self.assertIsNone(LockstepSweep(EXAMPLE).find(-1, noun_verb_pairs(12)))
+
+    @skipUnless(np is not None, 'numpy is not installed')
+    def test_runs_in_lockstep(self):
+        lockstep = self.assertSameAsScalar(EXAMPLE, noun_verb_pairs(12))
+        self.assertEqual((12 * 12, 0), (lockstep.vectorized, lockstep.scalar))
+
+    @skipUnless(np is not None, 'numpy is not installed')
+    def test_only_failing_machines_fall_back(self):
+        lockstep = self.assertSameAsScalar(SQUARE_COUNT_DOWN, [(0, 3), (1, 3), (3, 3)])
+        self.assertEqual((2, 1), (lockstep.vectorized, lockstep.scalar))
+
+    def test_input_falls_back(self):
+        # reads an input in to cell 0, the parameters go in cells 3 & 4, which are never run
+        lockstep = LockstepSweep([3, 0, 99, 0, 0], (3, 4))
+        with patch('builtins.input') as console:
+            self.assertEqual([None, None], lockstep.run([(1, 2), (3, 4)]))
+        # there's no input to give them, so the machines are left paused rather than waiting on the console
+        self.assertFalse(console.called)
+        self.assertEqual((0, 2), (lockstep.vectorized, lockstep.scalar))
+
+    def test_only_machines_reading_input_pause(self):
+        # halts straight away when cell 8 is 0, otherwise jumps to reading an input
+        lockstep = LockstepSweep([1005, 8, 4, 99, 3, 0, 99, 0, 0], (8,))
+        with patch('builtins.input') as console:
+            self.assertEqual([1005, None], lockstep.run([(0,), (1,)]))
+            self.assertEqual((0,), lockstep.find(1005, [(1,), (0,)]))
+        self.assertFalse(console.called)
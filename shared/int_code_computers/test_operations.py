@@ -1,7 +1,7 @@
 from unittest import TestCase
 
 from shared.int_code_computers.operations import AddOperation, MultiplyOperation, JumpIfTrueOperation, \
-    JumpIfFalseOperation, LessThanOperation, EqualsOperation
+    JumpIfFalseOperation, LessThanOperation, EqualsOperation, OperationFactory, get_input, get_inputs
 from shared.int_code_computers.program import Program
 from shared.int_code_computers.state import State
 
@@ -189,3 +189,32 @@ class TestOperations(TestCase):
         self.assertEqual(expected_end_pointer, state.index)
         self.assertEqual(expected_memory, state.memory)
 
+    def test_factory_decodes_op_code_and_modes(self):
+        factory = OperationFactory()
+        operation, modes = factory.decode(1002)
+        self.assertIsInstance(operation, MultiplyOperation)
+        self.assertEqual((0, 1, 0), modes)
+        operation, modes = factory.decode(105)
+        self.assertIsInstance(operation, JumpIfTrueOperation)
+        self.assertEqual((1, 0), modes)
+
+    def test_factory_rejects_unknown_op_code(self):
+        factory = OperationFactory()
+        self.assertIsNone(factory.decode(50))
+        self.assertRaises(RuntimeError, factory.resolve, State([50, 0, 0, 0], 0))
+
+    def test_get_input_resolves_modes(self):
+        #            0, 1, 2, 3
+        memory = [1001, 3, 7, 4]
+        state = State(memory, 0)
+        self.assertEqual(4, get_input(state, 1))  # position mode -> memory[3]
+        self.assertEqual(7, get_input(state, 2))  # immediate mode
+        self.assertEqual([4, 7, None], get_inputs(state, 4))  # memory[4] does not exist
+
+    def test_get_input_out_of_memory_is_none(self):
+        #            0, 1,  2
+        memory = [1001, 9, 7]
+        state = State(memory, 0)
+        self.assertIsNone(get_input(state, 1))  # memory[9] does not exist
+        self.assertEqual(7, get_input(state, 2))
+        self.assertIsNone(get_input(state, 3))  # the parameter itself is past the end of memory
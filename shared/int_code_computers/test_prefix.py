@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from shared.int_code_computers.cache import ResultCache, HashedState
+from shared.int_code_computers.channels import Channel, CollectingOutput
+from shared.int_code_computers.prefix import InputTree
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.tracing import Tracer
+
+# counts cell 20 down from 50 before reading anything, then reads a & b, outputs a, then outputs a * b
+COUNT_THEN_MULTIPLY = [1001, 20, -1, 20, 1005, 20, 0,
+                       3, 21, 4, 21,
+                       3, 22, 2, 21, 22, 23, 4, 23,
+                       99, 50, 0, 0, 0]
+
+
+class TestInputTree(TestCase):
+
+    def test_branches(self):
+        branches = list(InputTree(COUNT_THEN_MULTIPLY, [[1, 2, 3], [10, 20]]).branches())
+        self.assertEqual([(1, 10), (1, 20), (2, 10), (2, 20), (3, 10), (3, 20)],
+                         [branch.inputs for branch in branches])
+        self.assertEqual((2, 40), branches[3].outputs)
+        self.assertTrue(all(branch.status == Status.HALTED for branch in branches))
+        self.assertEqual(105, branches[0].program.instructions_executed)
+
+    def test_prefix_executed_once(self):
+        tree = InputTree(COUNT_THEN_MULTIPLY, [[1, 2, 3], [10, 20]])
+        list(tree.branches())
+        # 100 for the count down, 2 for each of the 3 first inputs, 3 for each of the 6 second inputs
+        self.assertEqual(100 + 3 * 2 + 6 * 3, tree.instructions_executed)
+
+    def test_same_results_as_separate_runs(self):
+        for branch in InputTree(COUNT_THEN_MULTIPLY, [[4, 5], [6, 7]]).branches():
+            outputs = CollectingOutput()
+            p = Program(COUNT_THEN_MULTIPLY.copy(), Channel(branch.inputs), outputs)
+            p.run()
+            self.assertEqual(tuple(outputs.values), branch.outputs)
+            self.assertEqual(list(p.state.memory), list(branch.program.state.memory))
+
+    def test_stops_at_last_stage(self):
+        branches = list(InputTree(COUNT_THEN_MULTIPLY, [[1, 2]]).branches())
+        self.assertEqual([(1,), (2,)], [branch.inputs for branch in branches])
+        self.assertEqual(Status.AWAITING_INPUT, branches[0].status)
+        self.assertEqual((1,), branches[0].outputs)
+
+    def test_stops_at_halt(self):
+        branches = list(InputTree([3, 5, 4, 5, 99, 0], [[7, 8], [1, 2]]).branches())
+        self.assertEqual([((7,), (7,)), ((8,), (8,))], [(branch.inputs, branch.outputs) for branch in branches])
+
+    def test_fork_leaves_original_alone(self):
+        p = Program(COUNT_THEN_MULTIPLY.copy(), Channel(), CollectingOutput())
+        p.run()
+        fork = p.fork(Channel([3, 4]), CollectingOutput())
+        fork.run()
+        self.assertEqual([3, 12], fork.state.outputs.values)
+        self.assertEqual(Status.AWAITING_INPUT, p.status)
+        self.assertEqual(0, p.state.at(21))
+
+    def test_fork_keeps_channels_and_tools(self):
+        tracer, cache = Tracer(), ResultCache()
+        p = Program(COUNT_THEN_MULTIPLY.copy(), Channel(), CollectingOutput(), tracer=tracer, cache=cache)
+        p.run()
+        fork = p.fork()
+        self.assertIs(p.state.inputs, fork.state.inputs)
+        self.assertIs(p.state.outputs, fork.state.outputs)
+        self.assertIs(tracer, fork.tracer)
+        self.assertIs(cache, fork.cache)
+        self.assertIsInstance(fork.state, HashedState)
+        fork.state.inputs.write(3)
+        fork.state.inputs.write(4)
+        fork.run()
+        self.assertEqual([3, 12], p.state.outputs.values)
@@ -0,0 +1,74 @@
+import json
+from unittest import TestCase
+
+from shared.int_code_computers.channels import Channel
+from shared.int_code_computers.compiler import CompiledProgram
+from shared.int_code_computers.program import Program, Status
+from shared.int_code_computers.profiler import Profiler
+from shared.int_code_computers.tracing import Tracer
+
+# counts cell 9 down from 5 to 0, jumping back to the start while it isn't 0
+COUNT_DOWN = [1001, 9, -1, 9, 1005, 9, 0, 99, 0, 5]
+
+
+class TestProfiler(TestCase):
+
+    def test_counts(self):
+        profiler = Profiler()
+        p = Program(COUNT_DOWN.copy(), profiler=profiler)
+        p.run()
+        self.assertEqual(10, profiler.instructions)
+        self.assertEqual(p.instructions_executed, profiler.instructions)
+        self.assertEqual({'ADD': 5, 'JT': 5}, dict(profiler.op_counts))
+        self.assertEqual({0: 5, 4: 5}, dict(profiler.address_counts))
+
+    def test_loops(self):
+        profiler = Profiler()
+        Program(COUNT_DOWN.copy(), profiler=profiler).run()
+        self.assertEqual([{'header': 0, 'tail': 4, 'iterations': 4}], profiler.report()['hot_loops'])
+
+    def test_every_instruction_timed(self):
+        profiler = Profiler(sample_every=1)
+        Program(COUNT_DOWN.copy(), profiler=profiler).run()
+        self.assertEqual(10, profiler.sampled)
+        self.assertTrue(all(seconds >= 0 for seconds in profiler.estimated_phase_seconds().values()))
+
+    def test_sampled_timing(self):
+        profiler = Profiler(sample_every=4)
+        Program(COUNT_DOWN.copy(), profiler=profiler).run()
+        self.assertEqual(3, profiler.sampled)
+
+    def test_pausing_and_resuming(self):
+        profiler = Profiler()
+        inputs = Channel()
+        p = Program([3, 7, 4, 7, 99, 0, 0, 0], inputs, Channel(), profiler=profiler)
+        p.run()
+        self.assertEqual(Status.AWAITING_INPUT, p.status)
+        self.assertEqual(0, profiler.instructions)
+        inputs.write(12)
+        p.run()
+        self.assertEqual({'IN': 1, 'OUT': 1}, dict(profiler.op_counts))
+
+    def test_traces_as_well(self):
+        profiler = Profiler(sample_every=2)
+        tracer = Tracer()
+        Program(COUNT_DOWN.copy(), tracer=tracer, profiler=profiler).run()
+        self.assertEqual(10, tracer.recorded)
+
+    def test_compiled_program_falls_back_to_interpreter(self):
+        profiler = Profiler()
+        p = CompiledProgram(COUNT_DOWN.copy())
+        p.profiler = profiler
+        p.run()
+        self.assertEqual(10, profiler.instructions)
+
+    def test_reports(self):
+        profiler = Profiler()
+        Program(COUNT_DOWN.copy(), profiler=profiler).run()
+        report = json.loads(profiler.to_json(top=1))
+        self.assertEqual(10, report['instructions'])
+        self.assertEqual(1, len(report['hot_addresses']))
+        self.assertEqual(['decode', 'fetch', 'execute'], list(report['estimated_phase_seconds']))
+        text = profiler.to_text()
+        self.assertIn('Instructions executed: 10', text)
+        self.assertIn('0 <- 4', text)
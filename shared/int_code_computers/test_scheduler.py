@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from shared.int_code_computers.scheduler import Network, DeadlockError
+
+# reads a value, outputs it plus one and halts
+ADD_ONE = [3, 9, 1001, 9, 1, 9, 4, 9, 99, 0]
+# reads a value and outputs it minus one until it reads a 0, which it passes on before halting
+COUNT_DOWN = [3, 20, 1006, 20, 14, 1001, 20, -1, 20, 4, 20, 1105, 1, 0, 4, 20, 99, 0, 0, 0, 0]
+
+
+class TestNetwork(TestCase):
+
+    def test_pipeline(self):
+        network = Network()
+        network.add('a', ADD_ONE, [5])
+        network.add('b', ADD_ONE)
+        network.add('c', ADD_ONE)
+        network.pipeline(['a', 'b', 'c'])
+        result = network.collect('c')
+        stats = network.run()
+        self.assertEqual([8], result.values)
+        self.assertEqual(3, stats['c'].instructions)
+
+    def test_feedback_ring(self):
+        network = Network()
+        network.add('a', COUNT_DOWN, [5])
+        network.add('b', COUNT_DOWN)
+        network.ring(['a', 'b'])
+        from_a, from_b = network.collect('a'), network.collect('b')
+        stats = network.run()
+        self.assertEqual([4, 2, 0, 0], from_a.values)
+        self.assertEqual([3, 1, 0], from_b.values)
+        self.assertEqual(18, stats['a'].instructions)
+        self.assertEqual(13, stats['b'].instructions)
+
+    def test_broadcast(self):
+        network = Network()
+        network.add('a', ADD_ONE, [1])
+        network.add('b', ADD_ONE)
+        network.add('c', ADD_ONE)
+        network.broadcast('a', ['b', 'c'])
+        from_b, from_c = network.collect('b'), network.collect('c')
+        network.run()
+        self.assertEqual([3], from_b.values)
+        self.assertEqual([3], from_c.values)
+
+    def test_deadlock(self):
+        network = Network()
+        network.add('a', ADD_ONE)
+        network.add('b', ADD_ONE)
+        network.ring(['a', 'b'])
+        self.assertRaises(DeadlockError, network.run)
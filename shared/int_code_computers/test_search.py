@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+from shared.int_code_computers.program import Program
+from shared.int_code_computers.search import ParameterSweep, parallel_find, noun_verb_pairs, noun_verb_ranges, \
+    fit_affine, evaluate_affine, solve_for
+
+PROGRAM_CODE = [1, 0, 0, 3, 1, 1, 2, 3, 1, 3, 4, 3, 1, 5, 0, 3, 2, 6, 1, 19, 1, 5, 19, 23, 2, 6, 23, 27, 1, 27,
+                5, 31, 2, 9, 31, 35, 1, 5, 35, 39, 2, 6, 39, 43, 2, 6, 43, 47, 1, 5, 47, 51, 2, 9, 51, 55, 1, 5,
+                55, 59, 1, 10, 59, 63, 1, 63, 6, 67, 1, 9, 67, 71, 1, 71, 6, 75, 1, 75, 13, 79, 2, 79, 13, 83,
+                2, 9, 83, 87, 1, 87, 5, 91, 1, 9, 91, 95, 2, 10, 95, 99, 1, 5, 99, 103, 1, 103, 9, 107, 1, 13,
+                107, 111, 2, 111, 10, 115, 1, 115, 5, 119, 2, 13, 119, 123, 1, 9, 123, 127, 1, 5, 127, 131, 2,
+                131, 6, 135, 1, 135, 5, 139, 1, 139, 6, 143, 1, 143, 6, 147, 1, 2, 147, 151, 1, 151, 5, 0, 99,
+                2, 14, 0, 0]
+
+
+class TestParameterSweep(TestCase):
+
+    def test_runs_match_fresh_programs(self):
+        sweep = ParameterSweep(PROGRAM_CODE)
+        for noun, verb in [(12, 2), (56, 96), (12, 2)]:
+            program_code = PROGRAM_CODE.copy()
+            program_code[1:3] = [noun, verb]
+            self.assertEqual(Program(program_code).run(), sweep.run((noun, verb)))
+        # the original image is left untouched
+        self.assertEqual(1, sweep.image[0])
+
+    def test_find(self):
+        sweep = ParameterSweep(PROGRAM_CODE)
+        self.assertEqual((56, 96), sweep.find(19690720, noun_verb_pairs()))
+        self.assertIsNone(sweep.find(-1, noun_verb_pairs(10)))
+
+    def test_parallel_find(self):
+        candidates = [(noun, verb) for noun in range(50, 60) for verb in range(100)]
+        self.assertEqual((56, 96), parallel_find(PROGRAM_CODE, 19690720, candidates, workers=2, chunk_size=100))
+        self.assertIsNone(parallel_find(PROGRAM_CODE, -1, candidates[:200], workers=2, chunk_size=100))
+
+    def test_parallel_find_matches_serial_order(self):
+        # memory[0] = noun + verb, so both chunks hold an answer. the second chunk finds its own straight away, but
+        # the answer from the first chunk is the one returned, like a serial search
+        program_code = [1101, 0, 0, 0, 99]
+        candidates = [(50, verb) for verb in range(101)] + [(75, 75)]
+        serial = ParameterSweep(program_code).find(150, candidates)
+        self.assertEqual((50, 100), serial)
+        for _ in range(3):
+            self.assertEqual(serial, parallel_find(program_code, 150, candidates, workers=2, chunk_size=101))
+
+
+class TestAffineSolver(TestCase):
+
+    def test_fit_affine(self):
+        ranges = noun_verb_ranges()
+        fitted = fit_affine(ParameterSweep(PROGRAM_CODE), ranges)
+        self.assertIsNotNone(fitted)
+        self.assertEqual(19690720, evaluate_affine(fitted, (56, 96)))
+
+    def test_fit_affine_rejects_non_linear_program(self):
+        # memory[0] = noun * verb, as the value at each position from 5 onwards is the position itself
+        program_code = [2, 0, 0, 0, 99, 5, 6, 7, 8, 9]
+        self.assertIsNone(fit_affine(ParameterSweep(program_code), [range(5, 10), range(5, 10)]))
+
+    def test_solve_for(self):
+        self.assertEqual((56, 96), solve_for(PROGRAM_CODE, 19690720, noun_verb_ranges()))
+        self.assertIsNone(solve_for(PROGRAM_CODE, -1, noun_verb_ranges(), workers=2))
+
+    def test_solve_for_program_affine_at_probes_only(self):
+        # memory[0] = noun + verb, unless noun is 7 when it's 1000. none of the points probed have a noun of 7, so
+        # the fit holds but has no solution for 1000
+        #               0, 1, 2,  3, 4, 5,  6,  7,    8,  9, 10,   11,12,   13, 14,   15, 16,17,18,19
+        program_code = [1101, 0, 0, 20, 8, 1, 24, 21, 1006, 21, 15, 1101, 0, 1000, 20, 1001, 20, 0, 0, 99,
+                        0, 0, 0, 0, 7]
+        ranges = [range(10), range(10)]
+        self.assertIsNotNone(fit_affine(ParameterSweep(program_code), ranges))
+        self.assertEqual((7, 0), solve_for(program_code, 1000, ranges, workers=1))
+
+    def test_solve_for_non_linear_program(self):
+        # memory[0] = noun * verb, where noun and verb point at the values 7 & 8 (at positions 5 and 6)
+        program_code = [2, 0, 0, 0, 99, 7, 8]
+        self.assertEqual((5, 6), solve_for(program_code, 56, [range(5, 7), range(5, 7)], workers=1))
@@ -0,0 +1,128 @@
+from unittest import TestCase
+
+from shared.int_code_computers.cache import HashedState
+from shared.int_code_computers.channels import Channel, CollectingOutput
+from shared.int_code_computers.program import Program
+from shared.int_code_computers.state import State, CopyOnWriteMemory, ArrayMemory, MIN_GROWTH, MAX_LAYERS
+
+
+class TestState(TestCase):
+
+    def test_fork_does_not_share_writes(self):
+        state = State([1, 0, 0, 0, 99])
+        snapshot = state.snapshot()
+        fork_1 = snapshot.fork()
+        fork_2 = snapshot.fork()
+        fork_1.assign(0, 5)
+        state.assign(1, 7)
+        self.assertEqual([5, 0, 0, 0, 99], fork_1.memory)
+        self.assertEqual([1, 0, 0, 0, 99], fork_2.memory)
+        self.assertEqual([1, 7, 0, 0, 99], state.memory)
+        # only the written cell is held by the fork
+        self.assertEqual({0: 5}, fork_1.memory.overlay)
+
+    def test_fork_of_fork(self):
+        state = State([1, 0, 0, 0, 99]).fork()
+        state.assign(4, 98)
+        fork = state.fork()
+        fork.assign(-1, 99)
+        self.assertEqual(98, state.at(4))
+        self.assertEqual(99, fork.at(4))
+        self.assertIs(state.memory.base, fork.memory.base)
+
+    def test_copy_on_write_memory_bounds(self):
+        memory = CopyOnWriteMemory([1, 2, 3])
+        self.assertRaises(IndexError, memory.__setitem__, 3, 0)
+        self.assertRaises(IndexError, memory.__getitem__, 3)
+        self.assertEqual([2, 3], memory[1:])
+
+    def test_run_program_on_forks(self):
+        snapshot = State([1, 0, 0, 0, 2, 0, 0, 0, 99]).snapshot()
+        # (1 + 1) * 2 -> 4
+        self.assertEqual(4, Program.from_state(snapshot.fork()).run())
+        fork = snapshot.fork()
+        fork.assign(0, 2)
+        # (2 * 2) * 4 -> 16
+        self.assertEqual(16, Program.from_state(fork).run())
+
+    def test_fork_keeps_channels_and_kind(self):
+        inputs, outputs = Channel([1]), CollectingOutput()
+        state = HashedState([1, 0, 0, 0, 99], inputs=inputs, outputs=outputs)
+        state.assign(1, 4)
+        fork = state.fork()
+        self.assertIsInstance(fork, HashedState)
+        self.assertEqual([1], fork.written)
+        self.assertIs(inputs, fork.inputs)
+        self.assertIs(outputs, fork.outputs)
+        self.assertEqual(1, fork.writes)
+
+    def test_forks_share_layers_of_writes(self):
+        state = State([0] * 10).fork()
+        state.assign(0, 1)
+        fork = state.fork()
+        # the parent's writes aren't copied, both read them from the same layer
+        self.assertEqual({}, fork.memory.overlay)
+        self.assertIs(state.memory.layers[-1], fork.memory.layers[-1])
+        fork.assign(0, 2)
+        state.assign(1, 3)
+        self.assertEqual([1, 3], state.memory[:2])
+        self.assertEqual([2, 0], fork.memory[:2])
+        for generation in range(2 * MAX_LAYERS):
+            fork.assign(2 + generation % 8, generation)
+            fork = fork.fork()
+        self.assertLessEqual(len(fork.memory.layers), MAX_LAYERS + 1)
+        self.assertEqual([2, 0, 24, 25, 26, 27, 28, 29, 30, 31], fork.memory)
+
+    def test_fork_of_array_memory(self):
+        memory = ArrayMemory([1101, 2, 3, 10, 99])
+        memory[10 ** 9] = 7
+        fork = State(memory).fork()
+        self.assertEqual(7, fork.at(10 ** 9))
+        self.assertEqual(0, fork.at(10 ** 6))
+        self.assertEqual(memory, fork.memory)
+        # runs past the end of the image, like the array memory does
+        self.assertEqual(1101, Program.from_state(fork).run())
+        self.assertEqual(5, fork.at(10))
+        self.assertEqual(0, memory[10])
+        self.assertRaises(IndexError, fork.memory.__getitem__, -1)
+        self.assertNotEqual(memory, fork.memory)
+
+
+class TestArrayMemory(TestCase):
+
+    def test_grows_when_written_past_the_end(self):
+        memory = ArrayMemory([1, 2, 3])
+        memory[5] = 6
+        self.assertEqual([1, 2, 3, 0, 0, 6], memory)
+        self.assertEqual(0, memory[100])
+        self.assertRaises(IndexError, memory.__getitem__, -1)
+
+    def test_far_writes_are_sparse(self):
+        memory = ArrayMemory([1, 2, 3])
+        memory[10 ** 12] = 7
+        self.assertEqual(3, len(memory))
+        self.assertEqual(7, memory[10 ** 12])
+        # growing over a sparse cell moves it in to the array
+        memory[3 * MIN_GROWTH] = 8
+        memory[MIN_GROWTH] = 1
+        memory[2 * MIN_GROWTH] = 2
+        memory[3 * MIN_GROWTH + 1] = 3
+        self.assertEqual(3 * MIN_GROWTH + 2, len(memory))
+        self.assertEqual({10 ** 12: 7}, memory.sparse)
+        self.assertEqual(8, memory[3 * MIN_GROWTH])
+
+    def test_falls_back_to_python_ints(self):
+        memory = ArrayMemory([1, 2, 3])
+        memory[1] = 2 ** 70
+        self.assertEqual([1, 2 ** 70, 3], memory)
+        self.assertEqual([2 ** 70], ArrayMemory([2 ** 70]))
+        self.assertEqual([1, 2, 2 ** 70, 4], ArrayMemory(iter([1, 2, 2 ** 70, 4])))
+
+    def test_sparse_cells_count_for_equality(self):
+        memory = ArrayMemory([1])
+        memory[10 ** 6] = 5
+        self.assertNotEqual([1], memory)
+        self.assertNotEqual(ArrayMemory([1]), memory)
+        self.assertEqual(memory, memory.copy())
+        memory[10 ** 6] = 0
+        self.assertEqual(ArrayMemory([1]), memory)
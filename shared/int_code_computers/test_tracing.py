@@ -0,0 +1,49 @@
+import logging as log
+from io import BytesIO
+from unittest import TestCase
+
+from shared.int_code_computers.channels import Channel
+from shared.int_code_computers.program import Program
+from shared.int_code_computers.test_channels import ADD_INPUTS
+from shared.int_code_computers.tracing import Tracer, TraceRecord
+
+
+class TestTracer(TestCase):
+
+    def test_records(self):
+        tracer = Tracer()
+        Program(ADD_INPUTS.copy(), Channel([2, 3]), Channel(), tracer).run()
+        self.assertEqual([TraceRecord(0, 3, 'IN', (None, None), (11, 2)),
+                          TraceRecord(2, 3, 'IN', (None, None), (12, 3)),
+                          TraceRecord(4, 1, 'ADD', (2, 3), (13, 5)),
+                          TraceRecord(8, 4, 'OUT', (5, None), None)], tracer.records())
+
+    def test_pausing_does_not_record(self):
+        tracer = Tracer()
+        inputs = Channel([2])
+        p = Program(ADD_INPUTS.copy(), inputs, Channel(), tracer)
+        p.run()
+        self.assertEqual(1, tracer.recorded)
+        inputs.write(3)
+        p.run()
+        self.assertEqual(4, tracer.recorded)
+        self.assertEqual('IN', tracer.records()[1].mnemonic)
+
+    def test_ring_buffer_keeps_most_recent(self):
+        tracer = Tracer(capacity=2)
+        Program(ADD_INPUTS.copy(), Channel([2, 3]), Channel(), tracer).run()
+        self.assertEqual(4, tracer.recorded)
+        self.assertEqual(['ADD', 'OUT'], [record.mnemonic for record in tracer.records()])
+
+    def test_dump_and_load(self):
+        tracer = Tracer(capacity=3)
+        Program(ADD_INPUTS.copy(), Channel([2, 3]), Channel(), tracer).run()
+        stream = BytesIO()
+        tracer.dump(stream)
+        stream.seek(0)
+        self.assertEqual(tracer.records(), Tracer.load(stream).records())
+
+    def test_no_logging_while_running(self):
+        p = Program(ADD_INPUTS.copy(), Channel([2, 3]), Channel())
+        with self.assertNoLogs(level=log.DEBUG):
+            p.run()
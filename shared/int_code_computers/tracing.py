@@ -0,0 +1,90 @@
+import struct
+from array import array
+from typing import List, Optional, Tuple, NamedTuple, BinaryIO
+
+from shared.int_code_computers.operations import Operation, OperationFactory, get_input
+from shared.int_code_computers.state import State
+
+# every record is packed as: index, op code (with modes), first operand, second operand, write address, written value
+RECORD_WIDTH = 6
+# stands in for missing operands and writes, and for values that don't fit in 64 bits
+NO_VALUE = -2 ** 63
+
+
+class TraceRecord(NamedTuple):
+    index: int
+    op_value: int
+    mnemonic: str
+    operands: Tuple[Optional[int], Optional[int]]
+    write: Optional[Tuple[int, Optional[int]]]
+
+
+class Tracer:
+    # keeps the most recent `capacity` executed instructions in a ring buffer of packed 64 bit ints
+    __HEADER = struct.Struct('<4sQQ')
+    __MAGIC = b'ICT1'
+    capacity: int
+    recorded: int
+    __buffer: array
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.recorded = 0
+        self.__buffer = array('q', bytes(8 * RECORD_WIDTH * capacity))
+        self.__write_address = None
+
+    @staticmethod
+    def __pack(value: Optional[int]) -> int:
+        return NO_VALUE if value is None or not NO_VALUE < value < 2 ** 63 else value
+
+    @staticmethod
+    def __unpack(value: int) -> Optional[int]:
+        return None if value == NO_VALUE else value
+
+    def before(self, state: State, op: Operation) -> None:
+        slot = (self.recorded % self.capacity) * RECORD_WIDTH
+        buffer = self.__buffer
+        buffer[slot] = Tracer.__pack(state.index)
+        buffer[slot + 1] = Tracer.__pack(state.memory[state.index])
+        # only parameters that are read count as operands, the one written to is recorded as the write
+        buffer[slot + 2] = Tracer.__pack(get_input(state, 1) if op.op_length > 1 and op.writes_to != 1 else None)
+        buffer[slot + 3] = Tracer.__pack(get_input(state, 2) if op.op_length > 2 and op.writes_to != 2 else None)
+        self.__write_address = None if op.writes_to is None else state.at(state.index + op.writes_to)
+        buffer[slot + 4] = Tracer.__pack(self.__write_address)
+
+    def after(self, state: State) -> None:
+        # the record only counts once its instruction completed, i.e. not when it paused awaiting input
+        slot = (self.recorded % self.capacity) * RECORD_WIDTH
+        self.__buffer[slot + 5] = NO_VALUE if self.__write_address is None \
+            else Tracer.__pack(state.memory[self.__write_address])
+        self.recorded += 1
+
+    def records(self, op_factory: OperationFactory = None) -> List[TraceRecord]:
+        op_factory = OperationFactory() if op_factory is None else op_factory
+        kept = min(self.recorded, self.capacity)
+        first = self.recorded - kept
+        records = []
+        for record_number in range(first, self.recorded):
+            slot = (record_number % self.capacity) * RECORD_WIDTH
+            index, op_value, operand_1, operand_2, write_address, written = self.__buffer[slot:slot + RECORD_WIDTH]
+            decoded = op_factory.decode(op_value)
+            records.append(TraceRecord(index, op_value, '?' if decoded is None else decoded[0].mnemonic,
+                                       (Tracer.__unpack(operand_1), Tracer.__unpack(operand_2)),
+                                       None if write_address == NO_VALUE
+                                       else (write_address, Tracer.__unpack(written))))
+        return records
+
+    def dump(self, stream: BinaryIO) -> None:
+        stream.write(Tracer.__HEADER.pack(Tracer.__MAGIC, self.capacity, self.recorded))
+        stream.write(self.__buffer.tobytes())
+
+    @staticmethod
+    def load(stream: BinaryIO):
+        magic, capacity, recorded = Tracer.__HEADER.unpack(stream.read(Tracer.__HEADER.size))
+        if magic != Tracer.__MAGIC:
+            raise RuntimeError('Stream does not hold an Intcode trace')
+        tracer = Tracer(capacity)
+        tracer.recorded = recorded
+        tracer.__buffer = array('q')
+        tracer.__buffer.frombytes(stream.read(8 * RECORD_WIDTH * capacity))
+        return tracer